@@ -1,8 +1,13 @@
 import numpy as np
 import tensorflow as tf
 
+from ai.prioritized_replay import PrioritizedReplayBuffer
+from ai.replay_buffer import ReplayBuffer
+
 class AIController:
-    def __init__(self, state_size, action_size, learning_rate=0.001, gamma=0.95, epsilon=1.0, epsilon_decay=0.995, epsilon_min=0.1):
+    def __init__(self, state_size, action_size, learning_rate=0.001, gamma=0.95, epsilon=1.0, epsilon_decay=0.995, epsilon_min=0.1,
+                 buffer_size=100000, batch_size=64, target_update_every=1000, double_dqn=True, prioritized_replay=False,
+                 priority_alpha=0.6, priority_beta=0.4):
         self.state_size = state_size
         self.action_size = action_size
         self.learning_rate = learning_rate
@@ -10,9 +15,26 @@ class AIController:
         self.epsilon = epsilon
         self.epsilon_decay = epsilon_decay
         self.epsilon_min = epsilon_min
+        self.batch_size = batch_size
+        self.target_update_every = target_update_every  # Gradient steps between target network syncs
+        self.double_dqn = double_dqn  # Online network picks next actions, target network scores them
+        self.train_steps = 0
+
+        # Experience replay memory, allocated once up front
+        self.prioritized_replay = prioritized_replay  # Replay transitions in proportion to their TD error
+        if prioritized_replay:
+            self.memory = PrioritizedReplayBuffer(buffer_size, state_size, alpha=priority_alpha, beta=priority_beta)
+        else:
+            self.memory = ReplayBuffer(buffer_size, state_size)
 
         # Q-Network
         self.model = self.build_model()
+        self._q_function = self.build_q_function(self.model)
+
+        # Target network, a lagged copy of the Q-network used for bootstrapped targets
+        self.target_model = self.build_model()
+        self.sync_target()
+        self._target_function = self.build_target_function()
 
     def build_model(self):
         model = tf.keras.Sequential([
@@ -23,23 +45,242 @@ class AIController:
         model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=self.learning_rate), loss='mse')
         return model
 
+    def build_q_function(self, model):
+        """
+        Compile a graph-mode forward pass for low-latency inference.
+
+        `model.predict` sets up a data pipeline and callbacks on every call,
+        which dominates the cost for single states. The traced function runs
+        the network directly; the fixed input signature keeps it from retracing
+        for different batch sizes.
+        """
+        @tf.function(input_signature=[tf.TensorSpec(shape=(None, self.state_size), dtype=tf.float32)])
+        def q_function(states):
+            return model(states, training=False)
+
+        return q_function
+
+    def build_target_function(self):
+        """
+        Compile the minibatch target computation into one graph call.
+
+        States and next states go through the online network as a single
+        stacked batch and next states go through the target network once, so
+        a minibatch costs two forward passes in total.
+
+        Returns:
+            callable: (states, actions, rewards, next_states, dones) ->
+                (Q-value targets of shape (B, action_size), TD errors of shape (B,)).
+        """
+        @tf.function(input_signature=[
+            tf.TensorSpec(shape=(None, self.state_size), dtype=tf.float32),
+            tf.TensorSpec(shape=(None,), dtype=tf.int32),
+            tf.TensorSpec(shape=(None,), dtype=tf.float32),
+            tf.TensorSpec(shape=(None, self.state_size), dtype=tf.float32),
+            tf.TensorSpec(shape=(None,), dtype=tf.float32),
+        ])
+        def target_function(states, actions, rewards, next_states, dones):
+            batch_size = tf.shape(states)[0]
+            online_q = self.model(tf.concat([states, next_states], axis=0), training=False)
+            q_values = online_q[:batch_size]
+            next_target_q = self.target_model(next_states, training=False)
+            if self.double_dqn:
+                next_actions = tf.argmax(online_q[batch_size:], axis=1, output_type=tf.int32)
+                next_q = tf.gather(next_target_q, next_actions, axis=1, batch_dims=1)
+            else:
+                next_q = tf.reduce_max(next_target_q, axis=1)
+            targets = rewards + self.gamma * next_q * (1.0 - dones)
+
+            # Only the taken action's Q-value moves towards its target
+            taken = tf.one_hot(actions, self.action_size, dtype=q_values.dtype)
+            td_errors = targets - tf.reduce_sum(q_values * taken, axis=1)
+            return q_values * (1.0 - taken) + targets[:, None] * taken, td_errors
+
+        return target_function
+
+    def sync_target(self):
+        """Copy the Q-network weights into the target network."""
+        self.target_model.set_weights(self.model.get_weights())
+
+    def predict_q(self, states):
+        """
+        Compute Q-values for a batch of states.
+
+        Args:
+            states (array-like): States of shape (N, state_size).
+
+        Returns:
+            np.ndarray: Q-values of shape (N, action_size).
+        """
+        states = np.asarray(states, dtype=np.float32).reshape(-1, self.state_size)
+        return np.array(self._q_function(states))
+
     def get_action(self, state):
         """Choose an action based on the epsilon-greedy policy."""
         if np.random.rand() < self.epsilon:
             return np.random.choice(self.action_size)  # Explore
-        q_values = self.model.predict(np.array([state]), verbose=0)
+        q_values = self.predict_q([state])
         return np.argmax(q_values[0])  # Exploit
 
+    def get_actions(self, states):
+        """
+        Choose an epsilon-greedy action for every state in a batch.
+
+        Args:
+            states (np.ndarray): States of shape (N, state_size).
+
+        Returns:
+            np.ndarray: Actions of shape (N,), from a single forward pass.
+        """
+        states = np.asarray(states, dtype=np.float32)
+        q_values = self.predict_q(states)
+        actions = np.argmax(q_values, axis=1)
+        explore = np.random.rand(len(states)) < self.epsilon
+        actions[explore] = np.random.randint(self.action_size, size=explore.sum())
+        return actions
+
     def train(self, state, action, reward, next_state, done):
-        """Train the Q-network."""
-        target = reward
-        if not done:
-            next_q_values = self.model.predict(np.array([next_state]), verbose=0)
-            target = reward + self.gamma * np.amax(next_q_values[0])
-        target_q_values = self.model.predict(np.array([state]), verbose=0)
-        target_q_values[0][action] = target
-        self.model.fit(np.array([state]), target_q_values, epochs=1, verbose=0)
+        """Train the Q-network on a single transition."""
+        self.train_batch(np.array([state], dtype=np.float32), np.array([action]), np.array([reward]),
+                         np.array([next_state], dtype=np.float32), np.array([done]))
+
+    def get_layer_weights(self):
+        """
+        Get the dense layer parameters as NumPy arrays.
+
+        Returns:
+            tuple: (kernels, biases, activations), one entry per dense layer.
+        """
+        kernels, biases, activations = [], [], []
+        for layer in self.model.layers:
+            kernel, bias = layer.get_weights()
+            kernels.append(kernel)
+            biases.append(bias)
+            activations.append(layer.get_config()["activation"])
+        return kernels, biases, activations
+
+    def export_weights(self, path):
+        """
+        Save the Q-network in the `.npz` format read by `NumpyPolicy.load`.
+
+        Args:
+            path (str): Destination file path.
+        """
+        kernels, biases, activations = self.get_layer_weights()
+        arrays = {"num_layers": np.array(len(kernels)), "activations": np.array(activations)}
+        for i, (kernel, bias) in enumerate(zip(kernels, biases)):
+            arrays[f"kernel_{i}"] = kernel
+            arrays[f"bias_{i}"] = bias
+        np.savez(path, **arrays)
+
+    def get_training_state(self, include_replay=False):
+        """
+        Snapshot everything needed to resume training, as NumPy arrays.
+
+        The arrays are copies, so the snapshot can be written to disk from
+        another thread while training carries on.
+
+        Args:
+            include_replay (bool): Also copy the replay memory.
+
+        Returns:
+            dict: Flat mapping of names to arrays, as accepted by `set_training_state`.
+        """
+        state = {"epsilon": np.array(self.epsilon), "train_steps": np.array(self.train_steps)}
+        for prefix, weights in (("model", self.model.get_weights()), ("target", self.target_model.get_weights()),
+                                ("optimizer", [v.numpy() for v in self._optimizer_variables()])):
+            state[f"num_{prefix}"] = np.array(len(weights))
+            for i, weight in enumerate(weights):
+                state[f"{prefix}_{i}"] = weight
+        if include_replay:
+            for name, array in self.memory.state_dict().items():
+                state[f"replay_{name}"] = array
+        return state
+
+    def set_training_state(self, state):
+        """
+        Restore a snapshot from `get_training_state`.
+
+        Args:
+            state (Mapping): Arrays by name, e.g. an opened `.npz` checkpoint.
+        """
+        self.epsilon = float(state["epsilon"])
+        self.train_steps = int(state["train_steps"])
+        self.model.set_weights([state[f"model_{i}"] for i in range(int(state["num_model"]))])
+        self.target_model.set_weights([state[f"target_{i}"] for i in range(int(state["num_target"]))])
+        for i, variable in enumerate(self._optimizer_variables()[:int(state["num_optimizer"])]):
+            variable.assign(state[f"optimizer_{i}"])
+        if "replay_actions" in state:
+            self.memory.load_state_dict({name[len("replay_"):]: state[name] for name in state
+                                         if name.startswith("replay_")})
+
+    def _optimizer_variables(self):
+        """Optimizer slot variables, created first if no training step has run yet."""
+        optimizer = self.model.optimizer
+        variables = optimizer.variables
+        if callable(variables):
+            variables = variables()
+        if not variables:
+            optimizer.build(self.model.trainable_variables)
+            variables = optimizer.variables
+            if callable(variables):
+                variables = variables()
+        return list(variables)
+
+    def remember(self, state, action, reward, next_state, done):
+        """Store a transition in the replay memory."""
+        self.memory.add(state, action, reward, next_state, done)
+
+    def replay(self):
+        """
+        Train on one random minibatch from the replay memory.
+
+        Returns:
+            bool: False if the memory does not hold a full minibatch yet.
+        """
+        if len(self.memory) < self.batch_size:
+            return False
+        if self.prioritized_replay:
+            *batch, indices, weights = self.memory.sample_prioritized(self.batch_size)
+            td_errors = self.train_batch(*batch, weights=weights)
+            self.memory.update_priorities(indices, td_errors)
+        else:
+            self.train_batch(*self.memory.sample(self.batch_size))
+        return True
+
+    def train_batch(self, states, actions, rewards, next_states, dones, weights=None):
+        """
+        Train the Q-network on a minibatch with a single gradient step.
+
+        Targets use the target network, with Double-DQN action selection when
+        `double_dqn` is set. The target network is synced every
+        `target_update_every` calls.
+
+        Args:
+            states (np.ndarray): Shape (B, state_size).
+            actions (np.ndarray): Shape (B,).
+            rewards (np.ndarray): Shape (B,).
+            next_states (np.ndarray): Shape (B, state_size).
+            dones (np.ndarray): Shape (B,).
+            weights (np.ndarray): Optional per-transition loss weights of shape
+                (B,), e.g. importance-sampling weights from prioritized replay.
+
+        Returns:
+            np.ndarray: TD error of every transition before the update, shape (B,).
+        """
+        target_q_values, td_errors = self._target_function(
+            np.asarray(states, dtype=np.float32), np.asarray(actions, dtype=np.int32),
+            np.asarray(rewards, dtype=np.float32), np.asarray(next_states, dtype=np.float32),
+            np.asarray(dones, dtype=np.float32),
+        )
+        self.model.train_on_batch(states, target_q_values, sample_weight=weights)
+
+        self.train_steps += 1
+        if self.train_steps % self.target_update_every == 0:
+            self.sync_target()
 
         # Update epsilon
         if self.epsilon > self.epsilon_min:
             self.epsilon *= self.epsilon_decay
+
+        return np.asarray(td_errors)
@@ -0,0 +1,85 @@
+import numpy as np
+
+
+class NumpyPolicy:
+    def __init__(self, weights, biases, activations, epsilon=0.0):
+        """
+        Inference-only Q-network evaluated with NumPy.
+
+        Mirrors the `AIController` action interface so it can drive a car
+        without importing TensorFlow.
+
+        Args:
+            weights (list): Kernel matrix of each dense layer, (inputs, outputs).
+            biases (list): Bias vector of each dense layer.
+            activations (list): Activation name of each layer ('relu' or 'linear').
+            epsilon (float): Exploration rate; 0 always picks the greedy action.
+        """
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activations = list(activations)
+        self.state_size = self.weights[0].shape[0]
+        self.action_size = self.weights[-1].shape[1]
+        self.epsilon = epsilon
+
+    @classmethod
+    def load(cls, path, epsilon=0.0):
+        """
+        Load a policy written by `AIController.export_weights`.
+
+        Args:
+            path (str): Path to the `.npz` file.
+            epsilon (float): Exploration rate.
+
+        Returns:
+            NumpyPolicy: The loaded policy.
+        """
+        with np.load(path) as data:
+            num_layers = int(data["num_layers"])
+            weights = [data[f"kernel_{i}"] for i in range(num_layers)]
+            biases = [data[f"bias_{i}"] for i in range(num_layers)]
+            activations = [str(a) for a in data["activations"]]
+        return cls(weights, biases, activations, epsilon=epsilon)
+
+    def set_weights(self, weights, biases):
+        """Replace the layer parameters, e.g. with a fresh copy from the learner."""
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+
+    def predict_q(self, states):
+        """
+        Compute Q-values for a batch of states.
+
+        Args:
+            states (array-like): States of shape (N, state_size).
+
+        Returns:
+            np.ndarray: Q-values of shape (N, action_size).
+        """
+        x = np.asarray(states, dtype=np.float32).reshape(-1, self.state_size)
+        for w, b, activation in zip(self.weights, self.biases, self.activations):
+            x = x @ w + b
+            if activation == "relu":
+                np.maximum(x, 0, out=x)
+        return x
+
+    def get_action(self, state):
+        """Choose an action based on the epsilon-greedy policy."""
+        if np.random.rand() < self.epsilon:
+            return np.random.choice(self.action_size)  # Explore
+        return np.argmax(self.predict_q([state])[0])  # Exploit
+
+    def get_actions(self, states):
+        """
+        Choose an epsilon-greedy action for every state in a batch.
+
+        Args:
+            states (np.ndarray): States of shape (N, state_size).
+
+        Returns:
+            np.ndarray: Actions of shape (N,).
+        """
+        actions = np.argmax(self.predict_q(states), axis=1)
+        explore = np.random.rand(len(actions)) < self.epsilon
+        actions[explore] = np.random.randint(self.action_size, size=explore.sum())
+        return actions
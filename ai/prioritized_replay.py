@@ -0,0 +1,180 @@
+import numpy as np
+
+from ai.replay_buffer import ReplayBuffer
+
+
+class SumTree:
+    def __init__(self, capacity):
+        """
+        Binary tree over preallocated arrays where every node holds the sum of its children.
+
+        Leaf `i` stores the priority of slot `i`. Updating a batch of leaves
+        and drawing a batch of proportional samples both walk the tree one
+        level at a time for all items together, costing O(B log n) in a
+        handful of NumPy calls.
+
+        Args:
+            capacity (int): Number of leaves.
+        """
+        self.capacity = capacity
+        self.leaf_offset = 1 << max(0, int(np.ceil(np.log2(max(capacity, 1)))))  # Leaves start here; root is 1
+        self.depth = self.leaf_offset.bit_length() - 1
+        self.nodes = np.zeros(2 * self.leaf_offset, dtype=np.float64)
+
+    @property
+    def total(self):
+        """Sum of all priorities."""
+        return float(self.nodes[1])
+
+    def get(self, indices):
+        """Priorities of the given leaves."""
+        return self.nodes[self.leaf_offset + np.asarray(indices)]
+
+    def update(self, indices, priorities):
+        """
+        Set the priorities of a batch of leaves and refresh their ancestors.
+
+        Args:
+            indices (np.ndarray): Leaf indices of shape (B,).
+            priorities (np.ndarray): New priorities of shape (B,).
+        """
+        nodes = self.leaf_offset + np.asarray(indices, dtype=np.int64)
+        self.nodes[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes >> 1)
+            self.nodes[nodes] = self.nodes[2 * nodes] + self.nodes[2 * nodes + 1]
+
+    def find(self, values):
+        """
+        Find the leaves whose cumulative priority range contains each value.
+
+        Args:
+            values (np.ndarray): Values in [0, total) of shape (B,).
+
+        Returns:
+            np.ndarray: Leaf indices of shape (B,).
+        """
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sum = self.nodes[left]
+            go_right = values >= left_sum
+            values -= np.where(go_right, left_sum, 0.0)
+            nodes = left + go_right
+        return nodes - self.leaf_offset
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    def __init__(self, capacity, state_size, alpha=0.6, beta=0.4, beta_steps=100000, priority_epsilon=1e-3,
+                 seed=None):
+        """
+        Replay buffer that samples transitions in proportion to their TD error.
+
+        Transitions are stored in the same preallocated ring as `ReplayBuffer`;
+        a `SumTree` alongside holds each slot's priority. New transitions get
+        the largest priority seen so far, so every one is replayed at least
+        once. Rare, surprising transitions such as crashes are then drawn far
+        more often than uniform sampling would.
+
+        Args:
+            capacity (int): Maximum number of transitions kept.
+            state_size (int): Length of a state vector.
+            alpha (float): How strongly priorities skew sampling; 0 is uniform.
+            beta (float): Initial importance-sampling correction, annealed to 1.
+            beta_steps (int): Number of `sample_prioritized` calls over which
+                beta reaches 1.
+            priority_epsilon (float): Added to every |TD error| so no
+                transition becomes impossible to draw.
+            seed (int): Seed for the sampler, as in `ReplayBuffer`.
+        """
+        super().__init__(capacity, state_size, seed)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = (1.0 - beta) / max(beta_steps, 1)
+        self.priority_epsilon = priority_epsilon
+        self.max_priority = 1.0  # Largest priority so far, before the alpha exponent
+        self.tree = SumTree(capacity)
+
+    def add(self, state, action, reward, next_state, done):
+        """Store a single transition with the current maximum priority."""
+        slot = self.position
+        super().add(state, action, reward, next_state, done)
+        self.tree.update(np.array([slot]), np.array([self.max_priority ** self.alpha]))
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """Store a batch of transitions with the current maximum priority, as in `ReplayBuffer.add_batch`."""
+        count = min(len(actions), self.capacity)
+        slots = (self.position + np.arange(count)) % self.capacity
+        super().add_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(slots, np.full(count, self.max_priority ** self.alpha))
+
+    def sample_prioritized(self, batch_size):
+        """
+        Draw a minibatch in proportion to priority, with importance-sampling weights.
+
+        The priority mass is split into `batch_size` equal strata with one
+        draw from each, which keeps a minibatch from piling onto a few
+        transitions. Weights are normalised by the largest weight in the
+        batch so they only ever scale updates down.
+
+        Args:
+            batch_size (int): Number of transitions to draw.
+
+        Returns:
+            tuple: (states, actions, rewards, next_states, dones, indices,
+                weights); pass `indices` back to `update_priorities`.
+        """
+        total = self.tree.total
+        stratum = total / batch_size
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * stratum
+        indices = np.minimum(self.tree.find(np.minimum(values, np.nextafter(total, 0))), self.size - 1)
+
+        probabilities = self.tree.get(indices) / total
+        weights = (self.size * probabilities) ** -self.beta
+        weights = (weights / weights.max()).astype(np.float32)
+        self.beta = min(1.0, self.beta + self.beta_increment)
+
+        return (
+            self.states[indices],
+            self.actions[indices],
+            self.rewards[indices],
+            self.next_states[indices],
+            self.dones[indices],
+            indices,
+            weights,
+        )
+
+    def update_priorities(self, indices, td_errors):
+        """
+        Set new priorities from the TD errors of a trained minibatch.
+
+        Args:
+            indices (np.ndarray): Indices from `sample_prioritized`.
+            td_errors (np.ndarray): TD errors of shape (B,).
+        """
+        priorities = np.abs(np.asarray(td_errors, dtype=np.float64)) + self.priority_epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
+
+    def state_dict(self):
+        """Copy the stored transitions and their priorities for checkpointing."""
+        state = super().state_dict()
+        state["priorities"] = self.tree.get(np.arange(self.size))
+        state["max_priority"] = np.array(self.max_priority)
+        state["beta"] = np.array(self.beta)
+        return state
+
+    def load_state_dict(self, state):
+        """Restore transitions and priorities saved by `state_dict`."""
+        super().load_state_dict(state)
+        self.tree.nodes[:] = 0.0
+        if "priorities" not in state:
+            self.tree.update(np.arange(self.size), np.full(self.size, self.max_priority ** self.alpha))
+            return
+        priorities = np.asarray(state["priorities"])
+        if len(priorities) > self.size:
+            priorities = np.roll(priorities, -int(state["position"]))[-self.size:]
+        self.tree.update(np.arange(self.size), priorities)
+        self.max_priority = float(state["max_priority"])
+        self.beta = float(state["beta"])
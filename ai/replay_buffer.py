@@ -0,0 +1,128 @@
+import numpy as np
+
+
+class ReplayBuffer:
+    def __init__(self, capacity, state_size, seed=None):
+        """
+        Fixed-size ring buffer of transitions backed by preallocated arrays.
+
+        Once full, new transitions overwrite the oldest ones, so memory use is
+        fixed at construction time (see `nbytes`).
+
+        Args:
+            capacity (int): Maximum number of transitions kept.
+            state_size (int): Length of a state vector.
+            seed (int): Seed for the minibatch sampler; drawn from the global
+                NumPy RNG if None, so `np.random.seed` makes runs repeatable.
+        """
+        self.capacity = capacity
+        self.state_size = state_size
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.bool_)
+        self.position = 0  # Next slot to write
+        self.size = 0  # Number of valid transitions
+        self.rng = np.random.default_rng(np.random.randint(2 ** 31) if seed is None else seed)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        """Total memory held by the transition arrays, in bytes."""
+        return sum(a.nbytes for a in (self.states, self.actions, self.rewards, self.next_states, self.dones))
+
+    def add(self, state, action, reward, next_state, done):
+        """Store a single transition, overwriting the oldest one when full."""
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """
+        Store a batch of transitions, e.g. one step of a `CarFleet`.
+
+        Args:
+            states (np.ndarray): Shape (B, state_size).
+            actions (np.ndarray): Shape (B,).
+            rewards (np.ndarray): Shape (B,).
+            next_states (np.ndarray): Shape (B, state_size).
+            dones (np.ndarray): Shape (B,).
+        """
+        count = len(actions)
+        if count > self.capacity:
+            # Only the newest transitions would survive anyway
+            states, actions, rewards, next_states, dones = (
+                np.asarray(a)[-self.capacity:] for a in (states, actions, rewards, next_states, dones)
+            )
+            count = self.capacity
+        slots = (self.position + np.arange(count)) % self.capacity
+        self.states[slots] = states
+        self.actions[slots] = actions
+        self.rewards[slots] = rewards
+        self.next_states[slots] = next_states
+        self.dones[slots] = dones
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def sample(self, batch_size):
+        """
+        Draw a uniform random minibatch of stored transitions.
+
+        Args:
+            batch_size (int): Number of transitions to draw (with replacement).
+
+        Returns:
+            tuple: (states, actions, rewards, next_states, dones) arrays.
+        """
+        indices = self.rng.integers(0, self.size, size=batch_size)
+        return (
+            self.states[indices],
+            self.actions[indices],
+            self.rewards[indices],
+            self.next_states[indices],
+            self.dones[indices],
+        )
+
+    def state_dict(self):
+        """
+        Copy the stored transitions for checkpointing.
+
+        Returns:
+            dict: Arrays holding the filled part of the buffer and the write position.
+        """
+        return {
+            "states": self.states[:self.size].copy(),
+            "actions": self.actions[:self.size].copy(),
+            "rewards": self.rewards[:self.size].copy(),
+            "next_states": self.next_states[:self.size].copy(),
+            "dones": self.dones[:self.size].copy(),
+            "position": np.array(self.position),
+        }
+
+    def load_state_dict(self, state):
+        """
+        Restore transitions saved by `state_dict`.
+
+        Args:
+            state (dict): Arrays from `state_dict`; the newest transitions are
+                kept if they no longer fit.
+        """
+        saved_size = len(state["actions"])
+        size = min(saved_size, self.capacity)
+        for name in ("states", "actions", "rewards", "next_states", "dones"):
+            saved = np.asarray(state[name])
+            if saved_size > size:
+                # Unroll the ring so the newest transitions come last, then keep those
+                saved = np.roll(saved, -int(state["position"]), axis=0)[-size:]
+            getattr(self, name)[:size] = saved
+        self.size = size
+        # A full buffer resumes overwriting where it left off; otherwise fill the free slots
+        self.position = int(state["position"]) % self.capacity if saved_size == self.capacity else size % self.capacity
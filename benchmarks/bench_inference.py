@@ -0,0 +1,51 @@
+"""
+Compare action-selection throughput of `model.predict` against the compiled
+`AIController.predict_q` path.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_inference
+"""
+import argparse
+import time
+
+import numpy as np
+
+from ai.ai_controller import AIController
+
+
+def actions_per_second(select, states, repeats):
+    """Time `select` over `repeats` calls and return states processed per second."""
+    select(states)  # Warm up (tracing, allocator)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        select(states)
+    elapsed = time.perf_counter() - start
+    return repeats * len(states) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=200, help="Calls per measurement.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 512])
+    args = parser.parse_args()
+
+    controller = AIController(state_size=9, action_size=5, epsilon=0.0)
+    rng = np.random.default_rng(0)
+
+    def keras_predict(states):
+        return np.argmax(controller.model.predict(states, verbose=0), axis=1)
+
+    def compiled(states):
+        return np.argmax(controller.predict_q(states), axis=1)
+
+    print(f"{'batch':>6} {'model.predict':>16} {'predict_q':>16} {'speedup':>8}")
+    for batch_size in args.batch_sizes:
+        states = rng.uniform(0, 400, size=(batch_size, 9)).astype(np.float32)
+        before = actions_per_second(keras_predict, states, args.repeats)
+        after = actions_per_second(compiled, states, args.repeats)
+        print(f"{batch_size:>6} {before:>14.0f}/s {after:>14.0f}/s {after / before:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
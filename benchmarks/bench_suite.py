@@ -0,0 +1,250 @@
+"""
+Throughput and latency benchmarks for sensing, simulation, track loading and
+learning, run over synthetic tracks of increasing edge density.
+
+Each benchmark reports calls per second, latency percentiles and the peak
+memory allocated during one call (from tracemalloc, measured in a separate
+pass so it does not skew the timings). Results can be written to JSON and
+compared against an earlier run:
+
+    python -m benchmarks.bench_suite --output bench.json
+    python -m benchmarks.bench_suite --baseline bench.json --tolerance 0.2
+
+The car benchmarks use the headless `CarPhysics`, which `Car` extends with
+rendering only.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from ai.numpy_policy import NumpyPolicy
+from game_objects.car_physics import CarPhysics
+from game_objects.Track.spline import smooth_points
+from game_objects.Track.track_binary import write_track_binary
+from game_objects.Track.track_geometry import TrackGeometry
+
+
+def make_track(num_edges, extent=(1600, 900), corridor_width=80.0, margin=40.0, seed=0):
+    """
+    Build a closed corridor of two wobbly concentric ellipses inside a fixed window.
+
+    The track always fills the same `extent` as the hand-drawn tracks, so a
+    larger `num_edges` means shorter edges and more of them per grid cell,
+    like a track drawn with finer strokes rather than a bigger one.
+
+    Args:
+        num_edges (int): Total number of edges over both walls.
+        extent (tuple): Width and height of the area the track fits in.
+        corridor_width (float): Distance between the two walls.
+        margin (float): Gap between the outer wall and the edge of `extent`.
+        seed (int): Seed for the wall wobble.
+
+    Returns:
+        tuple: (segments, start_point) for `write_track_binary` or a track JSON.
+    """
+    rng = np.random.default_rng(seed)
+    per_wall = max(num_edges // 2, 3)
+    angles = np.linspace(0, 2 * np.pi, per_wall + 1)
+    # A few smooth bumps, so denser walls trace the same shape instead of getting noisier
+    wobble_amplitude = 6.0
+    wobble = sum(2.0 * np.sin(k * angles + rng.uniform(0, 2 * np.pi)) for k in (5, 9, 13))
+    center_x, center_y = extent[0] / 2, extent[1] / 2
+    radius_x = center_x - margin - corridor_width / 2 - wobble_amplitude
+    radius_y = center_y - margin - corridor_width / 2 - wobble_amplitude
+
+    segments = []
+    for offset in (-corridor_width / 2, corridor_width / 2):
+        x = center_x + (radius_x + offset + wobble) * np.cos(angles)
+        y = center_y + (radius_y + offset + wobble) * np.sin(angles)
+        segments.append(np.column_stack((x, y)).tolist())
+    return segments, [float(center_x + radius_x + wobble[0]), float(center_y)]
+
+
+def measure(func, calls, warmup=3):
+    """
+    Time `func` and record its peak allocation.
+
+    Args:
+        func (callable): Zero-argument function to benchmark.
+        calls (int): Number of timed calls.
+        warmup (int): Untimed calls made first.
+
+    Returns:
+        dict: calls, steps_per_sec, p50_us, p95_us, p99_us, mean_us and peak_kib.
+    """
+    for _ in range(warmup):
+        func()
+
+    latencies = np.empty(calls)
+    clock = time.perf_counter
+    for i in range(calls):
+        start = clock()
+        func()
+        latencies[i] = clock() - start
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p95, p99 = np.percentile(latencies, (50, 95, 99)) * 1e6
+    return {
+        "calls": calls,
+        "steps_per_sec": calls / latencies.sum(),
+        "mean_us": latencies.mean() * 1e6,
+        "p50_us": p50,
+        "p95_us": p95,
+        "p99_us": p99,
+        "peak_kib": peak / 1024,
+    }
+
+
+def random_policy(state_size=9, action_size=5, hidden=24, seed=0):
+    """NumPy policy with the default network shape and random weights."""
+    rng = np.random.default_rng(seed)
+    kernels = [rng.normal(0, 0.1, size=(state_size, hidden)), rng.normal(0, 0.1, size=(hidden, hidden)),
+               rng.normal(0, 0.1, size=(hidden, action_size))]
+    biases = [np.zeros(hidden), np.zeros(hidden), np.zeros(action_size)]
+    return NumpyPolicy(kernels, biases, ["relu", "relu", "linear"])
+
+
+def bench_track(num_edges, calls, workdir):
+    """Sensing, simulation and loading benchmarks on one synthetic track."""
+    segments, start_point = make_track(num_edges)
+    json_path = os.path.join(workdir, f"track_{num_edges}.json")
+    trk_path = os.path.join(workdir, f"track_{num_edges}.trk")
+    with open(json_path, "w") as f:
+        json.dump({"segments": segments, "start_point": start_point, "end_point": None}, f)
+    write_track_binary(trk_path, segments, start_point, None)
+
+    track = TrackGeometry(json_path)
+    track_data = track.get_track_data()
+    car = CarPhysics.from_image_file(*start_point, scale=0.05)
+    policy = random_policy()
+    dt = 1 / 60
+
+    load_calls = max(3, min(calls, 200_000 // num_edges))
+    benchmarks = {
+        "cast_rays": (lambda: car.cast_rays(track_data), calls),
+        "check_collision": (lambda: car.check_collision(track_data), calls),
+        "update": (lambda: car.update(dt, {}, track_data, ai_controller=policy), calls),
+        "track_load_json": (lambda: TrackGeometry(json_path), load_calls),
+        "track_load_trk": (lambda: TrackGeometry(trk_path), load_calls),
+    }
+    results = []
+    for name, (func, n) in benchmarks.items():
+        car.reset(start_point)
+        results.append({"name": name, "edges": len(track.edges), **measure(func, n)})
+    return results
+
+
+def bench_spline(num_points, calls):
+    """Catmull-Rom smoothing of one freehand stroke of `num_points` points."""
+    rng = np.random.default_rng(0)
+    points = np.cumsum(rng.normal(0, 5, size=(num_points, 2)), axis=0).tolist()
+    return {"name": "smooth_points", "points": num_points, **measure(lambda: smooth_points(points, 10), calls)}
+
+
+def bench_controller(calls, batch_size=64):
+    """Single-state action selection and one minibatch update of the TensorFlow controller."""
+    from ai.ai_controller import AIController
+
+    controller = AIController(state_size=9, action_size=5, epsilon=0.0, batch_size=batch_size)
+    rng = np.random.default_rng(0)
+    state = tuple(rng.uniform(0, 400, size=9))
+    states = rng.uniform(0, 400, size=(batch_size, 9)).astype(np.float32)
+    actions = rng.integers(0, 5, size=batch_size)
+    rewards = rng.normal(size=batch_size).astype(np.float32)
+    next_states = rng.uniform(0, 400, size=(batch_size, 9)).astype(np.float32)
+    dones = rng.random(batch_size) < 0.05
+
+    return [
+        {"name": "get_action", **measure(lambda: controller.get_action(state), calls)},
+        {"name": "train_batch", "batch_size": batch_size,
+         **measure(lambda: controller.train_batch(states, actions, rewards, next_states, dones), max(calls // 10, 3))},
+    ]
+
+
+def result_key(result):
+    """Identify a result across runs by its name and size parameters."""
+    return (result["name"], result.get("edges"), result.get("points"), result.get("batch_size"))
+
+
+def compare(results, baseline, tolerance):
+    """
+    Report benchmarks whose throughput dropped by more than `tolerance`.
+
+    Returns:
+        list: Regressed results as (name, size, baseline steps/s, current steps/s).
+    """
+    previous = {result_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get(result_key(result))
+        if old and result["steps_per_sec"] < old["steps_per_sec"] * (1 - tolerance):
+            size = result.get("edges") or result.get("points") or result.get("batch_size")
+            regressions.append((result["name"], size, old["steps_per_sec"], result["steps_per_sec"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000],
+                        help="Track sizes in edges, all within a 1600x900 window.")
+    parser.add_argument("--calls", type=int, default=500, help="Timed calls per benchmark.")
+    parser.add_argument("--skip-controller", action="store_true", help="Skip the TensorFlow benchmarks.")
+    parser.add_argument("--output", help="Write results to this JSON file.")
+    parser.add_argument("--baseline", help="Earlier JSON output to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed fractional throughput drop before a result counts as a regression.")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for num_edges in args.sizes:
+            results.extend(bench_track(num_edges, args.calls, workdir))
+    for num_points in (10, 100, 1000):
+        results.append(bench_spline(num_points, args.calls))
+    if not args.skip_controller:
+        results.extend(bench_controller(args.calls))
+
+    print(f"{'benchmark':<18} {'size':>8} {'steps/s':>12} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'peak KiB':>10}")
+    for result in results:
+        size = result.get("edges") or result.get("points") or result.get("batch_size") or ""
+        print(f"{result['name']:<18} {size:>8} {result['steps_per_sec']:>12.1f} {result['p50_us']:>10.1f} "
+              f"{result['p95_us']:>10.1f} {result['p99_us']:>10.1f} {result['peak_kib']:>10.1f}")
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "calls": args.calls,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, size, before, after in regressions:
+            print(f"REGRESSION {name} ({size}): {before:.1f} -> {after:.1f} steps/s")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ class Controls:
         """
         self.key_handler = key.KeyStateHandler()  # Key state handler for manual control
         self.ai_enabled = False  # Toggle for AI control
+        self.rays_visible = True  # Toggle for drawing sensor rays
 
     def attach_to_window(self, window):
         """
@@ -30,6 +31,8 @@ class Controls:
         if symbol == key.A:
             self.ai_enabled = not self.ai_enabled
             print("AI control enabled." if self.ai_enabled else "AI control disabled.")
+        elif symbol == key.V:
+            self.rays_visible = not self.rays_visible
 
     def get_manual_input(self):
         """
@@ -45,6 +48,15 @@ class Controls:
             'right': self.key_handler[key.RIGHT],
         }
 
+    def are_rays_visible(self):
+        """
+        Check if sensor rays should be drawn.
+
+        Returns:
+            bool: True if ray rendering is enabled, False otherwise.
+        """
+        return self.rays_visible
+
     def is_ai_enabled(self):
         """
         Check if AI control is currently enabled.
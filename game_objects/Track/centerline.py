@@ -0,0 +1,182 @@
+import math
+
+import numpy as np
+
+from game_objects import raycast
+
+
+class Centerline:
+    def __init__(self, points, closed=True, search_radius=64.0):
+        """
+        Arc-length parameterization of the path along the middle of a track.
+
+        Progress is the arc length `s` of the closest point on the polyline.
+        Given the previous progress as a hint, `project` binary-searches the
+        cumulative lengths and only tests the few segments within
+        `search_radius` of it, so tracking a car costs O(log n) per step.
+
+        Args:
+            points (array-like): Path points of shape (N, 2), in driving order.
+            closed (bool): Whether the path loops back to its first point.
+            search_radius (float): Arc length searched on either side of the hint.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if closed and len(points) > 1 and not np.array_equal(points[0], points[-1]):
+            points = np.vstack((points, points[:1]))
+        self.points = points
+        self.closed = closed
+        self.search_radius = search_radius
+
+        self.starts = points[:-1]
+        self.vectors = points[1:] - points[:-1]
+        lengths = np.hypot(self.vectors[:, 0], self.vectors[:, 1])
+        self.lengths = np.concatenate(([0.0], np.cumsum(lengths)))  # Arc length at each point
+        self.total_length = float(self.lengths[-1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.inv_sq_lengths = np.where(lengths > 0, 1.0 / lengths ** 2, 0.0)
+
+    @property
+    def nbytes(self):
+        """Memory held by the path arrays, in bytes."""
+        return sum(a.nbytes for a in (self.points, self.vectors, self.lengths, self.inv_sq_lengths))
+
+    def project(self, x, y, hint=None, radius=None):
+        """
+        Find the arc length of the centerline point closest to (x, y).
+
+        If the closest point found near the hint lies on the edge of the
+        searched window, the point may have moved further than the window
+        reaches, so all segments are searched instead.
+
+        Args:
+            x (float): Query x.
+            y (float): Query y.
+            hint (float): Previous progress; only nearby segments are searched.
+                All segments are searched if None.
+            radius (float): Arc length searched on either side of the hint;
+                `search_radius` if None.
+
+        Returns:
+            float: Arc length in [0, total_length].
+        """
+        num_segments = len(self.starts)
+        if num_segments == 0:
+            return 0.0
+        if hint is None:
+            return self._closest(x, y, np.arange(num_segments))
+
+        radius = self.search_radius if radius is None else radius
+        low = np.searchsorted(self.lengths, hint - radius, side="right") - 1
+        high = np.searchsorted(self.lengths, hint + radius, side="left")
+        ids = np.arange(low, high + 1)
+        if self.closed:
+            ids %= num_segments
+        else:
+            ids = ids[(ids >= 0) & (ids < num_segments)]
+        if len(ids) >= num_segments:
+            return self._closest(x, y, np.arange(num_segments))
+
+        s, best = self._closest(x, y, ids, return_index=True)
+        at_path_end = not self.closed and ids[best] in (0, num_segments - 1)
+        if best in (0, len(ids) - 1) and not at_path_end:
+            return self._closest(x, y, np.arange(num_segments))
+        return s
+
+    def _closest(self, x, y, ids, return_index=False):
+        """Arc length of the point closest to (x, y) on the segments `ids`, and optionally its position in `ids`."""
+        starts = self.starts[ids]
+        vectors = self.vectors[ids]
+        t = ((x - starts[:, 0]) * vectors[:, 0] + (y - starts[:, 1]) * vectors[:, 1]) * self.inv_sq_lengths[ids]
+        t = np.clip(t, 0.0, 1.0)
+        dist_sq = (starts[:, 0] + t * vectors[:, 0] - x) ** 2 + (starts[:, 1] + t * vectors[:, 1] - y) ** 2
+        best = int(np.argmin(dist_sq))
+        segment = ids[best]
+        s = float(self.lengths[segment] + t[best] * (self.lengths[segment + 1] - self.lengths[segment]))
+        return (s, best) if return_index else s
+
+    def delta(self, s_from, s_to):
+        """
+        Signed progress from `s_from` to `s_to`, taking the short way round a loop.
+
+        Returns:
+            float: Positive when moving forward along the path.
+        """
+        delta = s_to - s_from
+        if self.closed and self.total_length > 0:
+            half = self.total_length / 2
+            delta = (delta + half) % self.total_length - half
+        return delta
+
+    def to_dict(self):
+        """Serializable form for the track JSON."""
+        return {"points": self.points.tolist(), "closed": self.closed}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of `to_dict`."""
+        return cls(data["points"], data.get("closed", True))
+
+
+def trace_centerline(edges, start_point, heading=90.0, step=8.0, look_ahead=100.0, max_turn=45.0, max_points=5000):
+    """
+    Walk the corridor from the start point to recover its centerline.
+
+    Each step steers towards the most open direction in a fan of rays, moves
+    `step` pixels and then slides sideways towards the midpoint between the
+    walls on either side. Keeping `look_ahead` close to the corridor width
+    stops the walk from cutting across the inside of hairpins. The walk ends
+    when it returns to the start (a closed loop) or runs into a dead end (an
+    open path).
+
+    Args:
+        edges (np.ndarray): Track edges of shape (M, 4).
+        start_point (tuple): Point to start from, inside the corridor.
+        heading (float): Initial driving direction in degrees.
+        step (float): Spacing between centerline points in pixels.
+        look_ahead (float): Length of the steering rays.
+        max_turn (float): Largest heading change per step in degrees.
+        max_points (int): Upper bound on the number of points.
+
+    Returns:
+        Centerline: The traced path.
+
+    Raises:
+        ValueError: If the walk reaches `max_points` without closing or
+            ending, i.e. it got lost instead of following the corridor.
+    """
+    fan = np.radians(np.arange(-120, 121, 5, dtype=np.float64))
+    fan_weight = (1 + np.cos(fan)) / 2  # Prefer going straight, but still allow hairpins
+    max_turn = math.radians(max_turn)
+    x, y = float(start_point[0]), float(start_point[1])
+    angle = math.radians(heading)
+    points = [(x, y)]
+    travelled = 0.0
+    closed = False
+
+    for _ in range(max_points):
+        distances, _ = raycast.cast_rays(x, y, angle + fan, look_ahead, edges)
+        if distances.max() <= step:
+            break
+        # Average neighbouring rays so a lone ray slipping through a gap between wall polylines is ignored
+        openness = np.convolve(distances, np.ones(5) / 5, mode="same") * fan_weight
+        angle += float(np.clip(fan[np.argmax(openness)], -max_turn, max_turn))
+        nx = x + math.cos(angle) * step
+        ny = y + math.sin(angle) * step
+
+        # Re-center between the walls on the left and right, at most one step at a time
+        (left, right), _ = raycast.cast_rays(nx, ny, np.array([angle + math.pi / 2, angle - math.pi / 2]),
+                                              look_ahead, edges)
+        shift = float(np.clip((left - right) / 2, -step, step))
+        nx -= math.sin(angle) * shift
+        ny += math.cos(angle) * shift
+
+        travelled += math.hypot(nx - x, ny - y)
+        x, y = nx, ny
+        if travelled > 8 * look_ahead and math.hypot(x - points[0][0], y - points[0][1]) < 2 * step:
+            closed = True
+            break
+        points.append((x, y))
+    else:
+        raise ValueError(f"Centerline trace from {tuple(start_point)} did not close within {max_points} points")
+
+    return Centerline(points, closed=closed)
@@ -0,0 +1,234 @@
+import hashlib
+import os
+
+import numpy as np
+
+from game_objects.Track.spatial_index import expand_cell_ranges
+
+
+class DistanceField:
+    def __init__(self, field, origin, resolution, max_distance):
+        """
+        Raster of the unsigned distance to the nearest track edge.
+
+        Sample `(i, j)` holds the distance at world point
+        `origin + (i, j) * resolution`, clamped to `max_distance`. Collision
+        checks and ray marching become array lookups instead of segment tests;
+        accuracy is traded for memory through `resolution`.
+
+        Use `bake` or `load_or_bake` to build one from track edges.
+
+        Args:
+            field (np.ndarray): float32 distances of shape (nx, ny).
+            origin (tuple): World position of sample (0, 0).
+            resolution (float): Spacing between samples in pixels.
+            max_distance (float): Distance the field is clamped to.
+        """
+        self.field = field
+        self.origin = (float(origin[0]), float(origin[1]))
+        self.resolution = float(resolution)
+        self.max_distance = float(max_distance)
+        # Interpolation can read up to about one sample spacing high right at a
+        # wall, so anything within one spacing counts as touching it
+        self.collision_distance = self.resolution
+        self.hit_distance = 0.5 * self.resolution  # Sphere-tracing stop threshold
+
+    @classmethod
+    def bake(cls, edges, resolution=4.0, max_distance=64.0, chunk_pairs=1 << 22):
+        """
+        Compute the field from track edges.
+
+        Each edge only writes the samples within `max_distance` of its bounding
+        box, so baking cost grows with track length rather than area times
+        edge count.
+
+        Args:
+            edges (np.ndarray): Track edges of shape (M, 4).
+            resolution (float): Spacing between samples in pixels.
+            max_distance (float): Distance the field is clamped to.
+            chunk_pairs (int): Upper bound on (edge, sample) pairs per batch.
+
+        Returns:
+            DistanceField: The baked field.
+        """
+        edges = np.asarray(edges, dtype=np.float64).reshape(-1, 4)
+        if len(edges):
+            low = np.minimum(edges[:, :2], edges[:, 2:]).min(axis=0) - max_distance
+            high = np.maximum(edges[:, :2], edges[:, 2:]).max(axis=0) + max_distance
+        else:
+            low = np.zeros(2)
+            high = np.zeros(2)
+        shape = tuple(int(v) for v in np.ceil((high - low) / resolution).astype(np.int64) + 1)
+        field = np.full(shape, max_distance, dtype=np.float32)
+
+        # Samples within max_distance of each edge's bounding box
+        x0, y0 = (np.ceil((np.minimum(edges[:, [0, 1]], edges[:, [2, 3]]) - max_distance - low) / resolution)
+                  .astype(np.int64).T)
+        x1, y1 = (np.floor((np.maximum(edges[:, [0, 1]], edges[:, [2, 3]]) + max_distance - low) / resolution)
+                  .astype(np.int64).T)
+        x0, y0 = np.maximum(x0, 0), np.maximum(y0, 0)
+        x1, y1 = np.minimum(x1, shape[0] - 1), np.minimum(y1, shape[1] - 1)
+        per_edge = (x1 - x0 + 1) * (y1 - y0 + 1)
+        flat = field.reshape(-1)
+
+        start = 0
+        while start < len(edges):
+            # Grow the batch until it would exceed chunk_pairs (at least one edge)
+            stop = start + max(1, int(np.searchsorted(np.cumsum(per_edge[start:]), chunk_pairs)))
+            owners, cells = expand_cell_ranges(x0[start:stop], y0[start:stop], x1[start:stop], y1[start:stop],
+                                               shape[0])
+            owners += start
+            i = cells % shape[0]
+            j = cells // shape[0]
+            px = low[0] + i * resolution
+            py = low[1] + j * resolution
+            distance = _point_segment_distance(px, py, edges[owners])
+            np.minimum.at(flat, i * shape[1] + j, distance.astype(np.float32))
+            start = stop
+
+        return cls(field, low, resolution, max_distance)
+
+    @classmethod
+    def load_or_bake(cls, edges, resolution=4.0, max_distance=64.0, cache_dir="game_objects/Track/.cache"):
+        """
+        Load a cached field for these edges and settings, baking it on a miss.
+
+        The cache key is a hash of the edge coordinates and the settings, so
+        any edit to the track produces a new file.
+
+        Args:
+            edges (np.ndarray): Track edges of shape (M, 4).
+            resolution (float): Spacing between samples in pixels.
+            max_distance (float): Distance the field is clamped to.
+            cache_dir (str): Directory holding cached fields; None disables caching.
+
+        Returns:
+            DistanceField: The loaded or freshly baked field.
+        """
+        if cache_dir is None:
+            return cls.bake(edges, resolution, max_distance)
+
+        digest = hashlib.sha1(np.ascontiguousarray(edges, dtype=np.float64).tobytes())
+        digest.update(f"{resolution}:{max_distance}".encode("utf-8"))
+        path = os.path.join(cache_dir, f"sdf_{digest.hexdigest()}.npz")
+        if os.path.exists(path):
+            with np.load(path) as data:
+                return cls(data["field"], data["origin"], float(data["resolution"]), float(data["max_distance"]))
+
+        distance_field = cls.bake(edges, resolution, max_distance)
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(path, field=distance_field.field, origin=np.array(distance_field.origin),
+                 resolution=resolution, max_distance=max_distance)
+        return distance_field
+
+    @property
+    def nbytes(self):
+        """Memory held by the raster, in bytes."""
+        return self.field.nbytes
+
+    def sample(self, x, y):
+        """
+        Bilinearly interpolate the distance at world points.
+
+        Points outside the raster are treated as `max_distance` away.
+
+        Args:
+            x (np.ndarray): World x coordinates.
+            y (np.ndarray): World y coordinates.
+
+        Returns:
+            np.ndarray: Distances with the broadcast shape of x and y.
+        """
+        gx = (np.asarray(x, dtype=np.float64) - self.origin[0]) / self.resolution
+        gy = (np.asarray(y, dtype=np.float64) - self.origin[1]) / self.resolution
+        nx, ny = self.field.shape
+        inside = (gx >= 0) & (gx <= nx - 1) & (gy >= 0) & (gy <= ny - 1)
+
+        i = np.clip(np.floor(gx), 0, nx - 2).astype(np.int64)
+        j = np.clip(np.floor(gy), 0, ny - 2).astype(np.int64)
+        fx = np.clip(gx - i, 0, 1)
+        fy = np.clip(gy - j, 0, 1)
+        f = self.field
+        value = ((f[i, j] * (1 - fx) + f[i + 1, j] * fx) * (1 - fy)
+                 + (f[i, j + 1] * (1 - fx) + f[i + 1, j + 1] * fx) * fy)
+        return np.where(inside, value, self.max_distance)
+
+    def collides(self, corners, sweep=(0.0, 0.0)):
+        """
+        Check whether a polygon's outline comes within `collision_distance` of a wall.
+
+        The outline is sampled at most one `resolution` apart. With a `sweep`,
+        the outline is also tested at translations along it spaced at most one
+        `resolution` apart, so a fast-moving polygon cannot skip over a wall.
+
+        Args:
+            corners (np.ndarray): Polygon corners of shape (C, 2), e.g. `CarPhysics.get_corners()`.
+            sweep (tuple): Translation (dx, dy) applied over the step.
+
+        Returns:
+            bool: True if any outline sample touches a wall.
+        """
+        corners = np.asarray(corners, dtype=np.float64)
+        following = np.roll(corners, -1, axis=0)
+        lengths = np.hypot(*(following - corners).T)
+        samples = int(np.ceil(lengths.max() / self.resolution)) + 1
+        t = np.linspace(0, 1, samples)[None, :, None]
+        points = (corners[:, None, :] + (following - corners)[:, None, :] * t).reshape(-1, 2)
+
+        positions = int(np.ceil(np.hypot(*sweep) / self.resolution)) + 1
+        if positions > 1:
+            shifts = np.linspace(0, 1, positions)[:, None, None] * np.asarray(sweep, dtype=np.float64)
+            points = (points[None, :, :] + shifts).reshape(-1, 2)
+        return bool((self.sample(points[..., 0], points[..., 1]) <= self.collision_distance).any())
+
+    def trace_rays(self, x, y, angles, ray_length, max_steps=64, directions=None):
+        """
+        Sphere-trace rays through the field.
+
+        Each ray advances by the sampled distance until it comes within
+        `hit_distance` of a wall or reaches `ray_length`. Results are
+        approximate to about one `resolution`.
+
+        Args:
+            x (float): Ray origin x.
+            y (float): Ray origin y.
+            angles (np.ndarray): Absolute ray angles in radians, shape (R,).
+            ray_length (float): Maximum distance a ray can reach.
+            max_steps (int): Iteration cap per ray.
+            directions (np.ndarray): Unit ray directions of shape (R, 2), used
+                instead of `angles` when given.
+
+        Returns:
+            np.ndarray: Distances of shape (R,), ray_length where nothing is hit.
+        """
+        if directions is None:
+            angles = np.asarray(angles, dtype=np.float64)
+            cos = np.cos(angles)
+            sin = np.sin(angles)
+        else:
+            cos = directions[:, 0]
+            sin = directions[:, 1]
+        travelled = np.zeros(len(cos))
+        active = np.ones(len(cos), dtype=bool)
+        for _ in range(max_steps):
+            if not active.any():
+                break
+            distance = self.sample(x + cos[active] * travelled[active], y + sin[active] * travelled[active])
+            hit = distance <= self.hit_distance
+            index = np.flatnonzero(active)
+            travelled[index[~hit]] += distance[~hit]
+            active[index[hit]] = False
+            active &= travelled < ray_length
+        return np.minimum(travelled, ray_length)
+
+
+def _point_segment_distance(px, py, edges):
+    """Distance from points (px, py) to the matching rows of `edges`."""
+    x1, y1, x2, y2 = edges[:, 0], edges[:, 1], edges[:, 2], edges[:, 3]
+    dx = x2 - x1
+    dy = y2 - y1
+    length_sq = dx * dx + dy * dy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(length_sq > 0, ((px - x1) * dx + (py - y1) * dy) / length_sq, 0.0)
+    t = np.clip(t, 0, 1)
+    return np.hypot(px - (x1 + t * dx), py - (y1 + t * dy))
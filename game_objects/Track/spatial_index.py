@@ -0,0 +1,210 @@
+import numpy as np
+
+
+def expand_cell_ranges(x0, y0, x1, y1, nx):
+    """
+    Expand inclusive 2D cell ranges into one (owner, cell) pair per covered cell.
+
+    Args:
+        x0, y0, x1, y1 (np.ndarray): Inclusive integer cell bounds of each range.
+        nx (int): Number of cells per row; cells are numbered `y * nx + x`.
+
+    Returns:
+        tuple: (owners, cells) where owners indexes the input ranges.
+    """
+    width = x1 - x0 + 1
+    counts = width * (y1 - y0 + 1)
+    owners = np.repeat(np.arange(len(x0)), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    width = width[owners]
+    cells = (y0[owners] + local // width) * nx + x0[owners] + local % width
+    return owners, cells
+
+
+class EdgeGrid:
+    def __init__(self, edges, cell_size=32.0):
+        """
+        Build a uniform grid over track edges for local ray and box queries.
+
+        Every edge is registered in each cell its bounding box overlaps. Cell
+        contents are stored CSR-style: the edges of cell `c` are
+        `cell_edges[cell_start[c]:cell_start[c + 1]]`.
+
+        Args:
+            edges (np.ndarray): Track edges of shape (M, 4) as (x1, y1, x2, y2).
+            cell_size (float): Side length of a grid cell in pixels.
+        """
+        self.edges = np.asarray(edges, dtype=np.float64).reshape(-1, 4)
+        self.cell_size = float(cell_size)
+
+        if len(self.edges):
+            self.origin = (self.edges[:, [0, 2]].min(), self.edges[:, [1, 3]].min())
+            span_x = self.edges[:, [0, 2]].max() - self.origin[0]
+            span_y = self.edges[:, [1, 3]].max() - self.origin[1]
+        else:
+            self.origin = (0.0, 0.0)
+            span_x = span_y = 0.0
+        self.nx = int(span_x // self.cell_size) + 1
+        self.ny = int(span_y // self.cell_size) + 1
+
+        self.cell_start, self.cell_edges = self._build()
+
+    @classmethod
+    def from_arrays(cls, edges, cell_size, origin, shape, cell_start, cell_edges):
+        """
+        Restore a grid from previously built arrays without rebuilding it.
+
+        Used by the binary track loader so memory-mapped indexes are shared
+        rather than recomputed in every process.
+
+        Args:
+            edges (np.ndarray): Track edges of shape (M, 4).
+            cell_size (float): Side length of a grid cell.
+            origin (tuple): Lower-left corner of the grid.
+            shape (tuple): Number of cells as (nx, ny).
+            cell_start (np.ndarray): CSR offsets of shape (nx * ny + 1,).
+            cell_edges (np.ndarray): Edge indices referenced by `cell_start`.
+
+        Returns:
+            EdgeGrid: The restored grid.
+        """
+        grid = cls.__new__(cls)
+        grid.edges = edges
+        grid.cell_size = float(cell_size)
+        grid.origin = (float(origin[0]), float(origin[1]))
+        grid.nx, grid.ny = int(shape[0]), int(shape[1])
+        grid.cell_start = cell_start
+        grid.cell_edges = cell_edges
+        return grid
+
+    @property
+    def nbytes(self):
+        """Memory held by the cell tables, in bytes (the edges belong to the track)."""
+        return self.cell_start.nbytes + self.cell_edges.nbytes
+
+    def _build(self):
+        """Register every edge in the cells covered by its bounding box."""
+        num_cells = self.nx * self.ny
+        if len(self.edges) == 0:
+            return np.zeros(num_cells + 1, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        x0, y0, x1, y1 = self._cell_range(
+            np.minimum(self.edges[:, 0], self.edges[:, 2]),
+            np.minimum(self.edges[:, 1], self.edges[:, 3]),
+            np.maximum(self.edges[:, 0], self.edges[:, 2]),
+            np.maximum(self.edges[:, 1], self.edges[:, 3]),
+        )
+        edge_ids, cells = expand_cell_ranges(x0, y0, x1, y1, self.nx)
+
+        order = np.argsort(cells, kind="stable")
+        cell_start = np.zeros(num_cells + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=num_cells), out=cell_start[1:])
+        return cell_start, edge_ids[order]
+
+    def _cell_range(self, xmin, ymin, xmax, ymax):
+        """Convert world-space bounds to clipped, inclusive cell ranges."""
+        ox, oy = self.origin
+        cs = self.cell_size
+        x0 = np.clip(np.floor((np.asarray(xmin) - ox) / cs), 0, self.nx - 1).astype(np.int64)
+        y0 = np.clip(np.floor((np.asarray(ymin) - oy) / cs), 0, self.ny - 1).astype(np.int64)
+        x1 = np.clip(np.floor((np.asarray(xmax) - ox) / cs), 0, self.nx - 1).astype(np.int64)
+        y1 = np.clip(np.floor((np.asarray(ymax) - oy) / cs), 0, self.ny - 1).astype(np.int64)
+        return x0, y0, x1, y1
+
+    def _gather(self, cells):
+        """Return the unique edge indices stored in the given cells."""
+        cells = np.unique(cells)
+        starts = self.cell_start[cells]
+        counts = self.cell_start[cells + 1] - starts
+        total = counts.sum()
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.unique(self.cell_edges[np.repeat(starts, counts) + offsets])
+
+    def query_box(self, xmin, ymin, xmax, ymax):
+        """
+        Find the edges registered in cells overlapping an axis-aligned box.
+
+        Args:
+            xmin (float): Left bound of the box.
+            ymin (float): Bottom bound of the box.
+            xmax (float): Right bound of the box.
+            ymax (float): Top bound of the box.
+
+        Returns:
+            np.ndarray: Sorted indices into `edges` of the candidate edges.
+        """
+        return self.query_boxes(xmin, ymin, xmax, ymax)
+
+    def query_boxes(self, xmin, ymin, xmax, ymax):
+        """
+        Find the edges registered in cells overlapping any of several boxes.
+
+        Args:
+            xmin (np.ndarray): Left bounds, shape (B,).
+            ymin (np.ndarray): Bottom bounds, shape (B,).
+            xmax (np.ndarray): Right bounds, shape (B,).
+            ymax (np.ndarray): Top bounds, shape (B,).
+
+        Returns:
+            np.ndarray: Sorted indices into `edges` of the candidate edges.
+        """
+        xmin, ymin, xmax, ymax = (np.atleast_1d(np.asarray(v, dtype=np.float64)) for v in (xmin, ymin, xmax, ymax))
+        ox, oy = self.origin
+        overlaps = ((xmax >= ox) & (ymax >= oy) & (xmin <= ox + self.nx * self.cell_size)
+                    & (ymin <= oy + self.ny * self.cell_size))
+        if not overlaps.any():
+            return np.empty(0, dtype=np.int64)
+        ranges = self._cell_range(xmin[overlaps], ymin[overlaps], xmax[overlaps], ymax[overlaps])
+        return self._gather(expand_cell_ranges(*ranges, self.nx)[1])
+
+    def query_rays(self, x, y, end_x, end_y):
+        """
+        Find the edges registered in any cell crossed by one or more rays.
+
+        Args:
+            x (float or np.ndarray): Ray start x, scalar or shape (R,).
+            y (float or np.ndarray): Ray start y, scalar or shape (R,).
+            end_x (float or np.ndarray): Ray end x, scalar or shape (R,).
+            end_y (float or np.ndarray): Ray end y, scalar or shape (R,).
+
+        Returns:
+            np.ndarray: Sorted indices into `edges` of the candidate edges.
+        """
+        x, y, end_x, end_y = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(v, dtype=np.float64)) for v in (x, y, end_x, end_y))
+        )
+        ox, oy = self.origin
+        cs = self.cell_size
+        gx0 = (x - ox) / cs
+        gy0 = (y - oy) / cs
+        dx = (end_x - x) / cs
+        dy = (end_y - y) / cs
+
+        # Parameters where each ray crosses a vertical or horizontal grid line.
+        # A ray spans at most `max_lines` lines per axis, so the candidate
+        # crossings fit in a fixed-width matrix padded with NaN.
+        max_lines = int(np.ceil(max(np.abs(dx).max(), np.abs(dy).max()))) + 1
+        steps = np.arange(1, max_lines + 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            line_x = np.where(dx[:, None] >= 0, np.floor(gx0)[:, None] + steps, np.ceil(gx0)[:, None] - steps)
+            line_y = np.where(dy[:, None] >= 0, np.floor(gy0)[:, None] + steps, np.ceil(gy0)[:, None] - steps)
+            tx = (line_x - gx0[:, None]) / dx[:, None]
+            ty = (line_y - gy0[:, None]) / dy[:, None]
+        t = np.concatenate((np.zeros((len(x), 1)), tx, ty, np.ones((len(x), 1))), axis=1)
+        t = np.where((t >= 0) & (t <= 1), t, np.nan)
+        t.sort(axis=1)
+
+        # The midpoint between consecutive crossings lies inside exactly one
+        # traversed cell; the end points cover rays that never leave a cell.
+        mid = np.concatenate((t[:, :1], (t[:, 1:] + t[:, :-1]) / 2, np.ones((len(x), 1))), axis=1)
+        ray_index = np.broadcast_to(np.arange(len(x))[:, None], mid.shape)
+        keep = ~np.isnan(mid)
+        mid = mid[keep]
+        ray_index = ray_index[keep]
+        cx = np.floor(gx0[ray_index] + dx[ray_index] * mid)
+        cy = np.floor(gy0[ray_index] + dy[ray_index] * mid)
+        inside = (cx >= 0) & (cx < self.nx) & (cy >= 0) & (cy < self.ny)
+        cells = (cy[inside] * self.nx + cx[inside]).astype(np.int64)
+        return self._gather(cells)
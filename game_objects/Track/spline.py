@@ -0,0 +1,39 @@
+import numpy as np
+
+
+def smooth_points(points, granularity):
+    """
+    Smooth points into a curve using Catmull-Rom splines.
+
+    Every span between consecutive interior control points is sampled at
+    `granularity` evenly spaced t values; all spans and t values are evaluated
+    in one vectorized pass.
+
+    Args:
+        points (list): Control points as (x, y) pairs.
+        granularity (int): Samples per span, including both ends.
+
+    Returns:
+        np.ndarray: Smoothed points of shape ((len(points) - 3) * granularity, 2),
+            or the input unchanged when there are fewer than 3 points.
+    """
+    if len(points) < 3:
+        return points  # Not enough points to smooth
+
+    points = np.asarray(points, dtype=np.float64)
+    p0 = points[:-3, None, :]
+    p1 = points[1:-2, None, :]
+    p2 = points[2:-1, None, :]
+    p3 = points[3:, None, :]
+
+    t = np.linspace(0, 1, granularity)[None, :, None]
+    t2 = t * t
+    t3 = t2 * t
+
+    smoothed = 0.5 * (
+        (2 * p1) +
+        (-p0 + p2) * t +
+        (2 * p0 - 5 * p1 + 4 * p2 - p3) * t2 +
+        (-p0 + 3 * p1 - 3 * p2 + p3) * t3
+    )
+    return smoothed.reshape(-1, 2)
@@ -0,0 +1,164 @@
+"""
+Compact binary track format (.trk) that can be memory-mapped read-only.
+
+Layout:
+    4 bytes   magic b"TRK1"
+    4 bytes   little-endian uint32 length of the JSON header
+    N bytes   JSON header (start/end points, grid metadata, array table)
+    ...       arrays, each starting on a 64-byte boundary
+
+Arrays:
+    edges            float32 (M, 4)   flat (x1, y1, x2, y2) edge list
+    segment_offsets  int32   (S + 1,) edges of polyline k are edges[off[k]:off[k + 1]]
+    cell_start       int32   (nx * ny + 1,) spatial index offsets (see EdgeGrid)
+    cell_edges       int32   (K,)     spatial index edge ids
+
+Convert a track saved by track_maker from the repository root:
+
+    python -m game_objects.Track.track_binary game_objects/Track/track.json game_objects/Track/track.trk
+"""
+import argparse
+import json
+import struct
+
+import numpy as np
+
+from game_objects.raycast import segments_to_edges
+from game_objects.Track.spatial_index import EdgeGrid
+
+MAGIC = b"TRK1"
+ALIGNMENT = 64
+
+
+def write_track_binary(path, segments, start_point, end_point, cell_size=32.0):
+    """
+    Write track geometry and its spatial index to a .trk file.
+
+    Args:
+        path (str): Destination file path.
+        segments (list): Track polylines, each a list of (x, y) points.
+        start_point (tuple): Car start point, or None.
+        end_point (tuple): Track end point, or None.
+        cell_size (float): Cell size of the baked spatial index.
+    """
+    segments = [segment for segment in segments if len(segment) >= 2]
+    edges = segments_to_edges(segments)
+    grid = EdgeGrid(edges, cell_size)
+    offsets = np.zeros(len(segments) + 1, dtype=np.int32)
+    np.cumsum([len(segment) - 1 for segment in segments], out=offsets[1:])
+
+    arrays = {
+        "edges": edges.astype(np.float32),
+        "segment_offsets": offsets,
+        "cell_start": grid.cell_start.astype(np.int32),
+        "cell_edges": grid.cell_edges.astype(np.int32),
+    }
+    header = {
+        "start_point": start_point,
+        "end_point": end_point,
+        "cell_size": grid.cell_size,
+        "origin": [float(v) for v in grid.origin],
+        "shape": [grid.nx, grid.ny],
+        "arrays": {},
+    }
+
+    # Array offsets depend on the header size and vice versa; a second pass
+    # plus 64 bytes of slack absorbs the change in digit count.
+    for _ in range(2):
+        header_bytes = json.dumps(header).encode("utf-8")
+        position = _align(len(MAGIC) + 4 + len(header_bytes) + 64)
+        for name, array in arrays.items():
+            header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": position}
+            position = _align(position + array.nbytes)
+    header_bytes = json.dumps(header).encode("utf-8")
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.write(b"\0" * (header["arrays"][name]["offset"] - f.tell()))
+            f.write(np.ascontiguousarray(array).tobytes())
+
+
+def read_track_binary(path):
+    """
+    Memory-map a .trk file read-only.
+
+    The returned arrays are views into one shared mapping, so every process
+    that opens the same file shares the pages instead of holding a copy.
+
+    Args:
+        path (str): Path to the .trk file.
+
+    Returns:
+        dict: edges, segment_offsets, index (EdgeGrid), start_point, end_point.
+    """
+    with open(path, "rb") as f:
+        if f.read(4) != MAGIC:
+            raise ValueError(f"{path} is not a binary track file")
+        (header_length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_length))
+
+    mapping = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {}
+    for name, info in header["arrays"].items():
+        dtype = np.dtype(info["dtype"])
+        count = int(np.prod(info["shape"], dtype=np.int64))
+        start = info["offset"]
+        arrays[name] = mapping[start:start + count * dtype.itemsize].view(dtype).reshape(info["shape"])
+
+    index = EdgeGrid.from_arrays(
+        arrays["edges"], header["cell_size"], header["origin"], header["shape"],
+        arrays["cell_start"], arrays["cell_edges"],
+    )
+    return {
+        "edges": arrays["edges"],
+        "segment_offsets": arrays["segment_offsets"],
+        "index": index,
+        "start_point": header["start_point"],
+        "end_point": header["end_point"],
+    }
+
+
+def edges_to_segments(edges, segment_offsets):
+    """
+    Rebuild the track polylines from a flat edge array.
+
+    Args:
+        edges (np.ndarray): Edges of shape (M, 4).
+        segment_offsets (np.ndarray): Polyline boundaries of shape (S + 1,).
+
+    Returns:
+        list: One (n, 2) point array per polyline.
+    """
+    segments = []
+    for start, end in zip(segment_offsets[:-1], segment_offsets[1:]):
+        segments.append(np.vstack((edges[start:end, 0:2], edges[end - 1, 2:4])))
+    return segments
+
+
+def convert_json(json_path, trk_path, cell_size=32.0):
+    """Convert a track JSON file written by `track_maker.save_track` to .trk."""
+    with open(json_path, "r") as f:
+        data = json.load(f)
+    write_track_binary(trk_path, data.get("segments", []), data.get("start_point"), data.get("end_point"),
+                       cell_size)
+
+
+def _align(position):
+    """Round `position` up to the next multiple of ALIGNMENT."""
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("json_path", help="Track JSON written by track_maker.")
+    parser.add_argument("trk_path", help="Output .trk file.")
+    parser.add_argument("--cell-size", type=float, default=32.0)
+    args = parser.parse_args()
+    convert_json(args.json_path, args.trk_path, args.cell_size)
+
+
+if __name__ == "__main__":
+    main()
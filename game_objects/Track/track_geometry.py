@@ -0,0 +1,213 @@
+import json
+import os
+
+import numpy as np
+
+from game_objects.raycast import edge_bounds, polyline_bounds, segments_to_edges
+from game_objects.Track.centerline import Centerline, trace_centerline
+from game_objects.Track.distance_field import DistanceField
+from game_objects.Track.spatial_index import EdgeGrid
+from game_objects.Track.track_binary import edges_to_segments, read_track_binary
+
+
+class TrackGeometry:
+    def __init__(self, save_file="game_objects/Track/track.json", cell_size=32.0, field_resolution=None):
+        """
+        Headless track model: segments, flattened edges and their spatial index.
+
+        Args:
+            save_file (str): Path to the track JSON file, or a memory-mapped
+                binary .trk file from `track_binary`.
+            cell_size (float): Cell size of the spatial index over the track edges.
+            field_resolution (float): If set, also bake a distance field of the
+                walls with this sample spacing (cached on disk) for lookup-based
+                collision checks.
+        """
+        self.segments = []  # Store segments as lists of connected points
+        self.cell_size = cell_size
+        self.edges = segments_to_edges([])  # Flat (M, 4) edge array for batched queries
+        self.index = EdgeGrid(self.edges, cell_size)  # Spatial index over self.edges
+        self.segment_offsets = np.zeros(1, dtype=np.int64)  # Edges of polyline k: offsets[k]:offsets[k + 1]
+        self.edge_bounds = edge_bounds(self.edges)  # Broad-phase box per edge
+        self.segment_bounds = polyline_bounds(self.edge_bounds, self.segment_offsets)  # Box per polyline
+        self.field_resolution = field_resolution
+        self.distance_field = None  # Optional DistanceField over self.edges
+        self.centerline = None  # Arc-length parameterized driving line, traced on first use
+        self.start_point = None  # Starting point for the car
+        self.end_point = None  # Ending point of the track
+        self.save_file = save_file
+
+        # Load the track from the file if it exists
+        if os.path.exists(self.save_file):
+            self.load()
+
+    def add_segment(self, segment):
+        """
+        Add a new segment to the track.
+
+        Args:
+            segment (list): A list of (x, y) tuples representing a track segment.
+        """
+        self.segments.append(segment)
+        self.centerline = None
+        self._build_index()
+
+    def set_start(self, x, y):
+        """Set the starting point of the track."""
+        self.start_point = (x, y)
+
+    def set_end(self, x, y):
+        """Set the ending point of the track."""
+        self.end_point = (x, y)
+
+    def reset(self):
+        """Clear the track."""
+        self.segments = []
+        self.centerline = None
+        self._build_index()
+        self.start_point = None
+        self.end_point = None
+
+    def save(self):
+        """
+        Save the track data to a JSON file.
+
+        Raises:
+            ValueError: If `save_file` is a .trk file; those are memory-mapped
+                while in use and are built from the JSON track instead.
+        """
+        if self.save_file.endswith(".trk"):
+            raise ValueError(f"Cannot save over binary track {self.save_file}; save it as JSON and use convert_json")
+        data = {
+            "segments": [np.asarray(segment).tolist() for segment in self.segments],
+            "start_point": self.start_point,
+            "end_point": self.end_point,
+        }
+        if self.centerline is not None:
+            data["centerline"] = self.centerline.to_dict()
+        with open(self.save_file, "w") as f:
+            json.dump(data, f)
+
+    def load(self):
+        """Load the track data from a file."""
+        if self.save_file.endswith(".trk"):
+            self._load_binary()
+            return
+
+        with open(self.save_file, "r") as f:
+            data = json.load(f)
+        self.segments = data.get("segments", [])
+        self.start_point = data.get("start_point")
+        self.end_point = data.get("end_point")
+        self.centerline = Centerline.from_dict(data["centerline"]) if data.get("centerline") else None
+        self._build_index()
+
+    def _load_binary(self):
+        """Memory-map a .trk file, reusing its baked spatial index."""
+        data = read_track_binary(self.save_file)
+        self.edges = data["edges"]
+        self.index = data["index"]
+        self.cell_size = self.index.cell_size
+        self.segment_offsets = data["segment_offsets"]
+        self.segments = edges_to_segments(self.edges, self.segment_offsets)
+        self.start_point = data["start_point"]
+        self.end_point = data["end_point"]
+        self.centerline = None
+        self._build_bounds()
+        self._build_distance_field()
+
+    def _build_index(self):
+        """Flatten the segments into edges and rebuild the spatial index."""
+        self.edges = segments_to_edges(self.segments)
+        self.index = EdgeGrid(self.edges, self.cell_size)
+        counts = [len(segment) - 1 for segment in self.segments if len(segment) >= 2]
+        self.segment_offsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+        self._build_bounds()
+        self._build_distance_field()
+
+    def _build_bounds(self):
+        """Precompute the broad-phase boxes of every edge and polyline."""
+        self.edge_bounds = edge_bounds(self.edges)
+        self.segment_bounds = polyline_bounds(self.edge_bounds, self.segment_offsets)
+
+    def _build_distance_field(self):
+        """Load or bake the distance field if one was requested."""
+        if self.field_resolution:
+            self.distance_field = DistanceField.load_or_bake(self.edges, self.field_resolution)
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the geometry and its derived indexes, in bytes."""
+        total = self.edges.nbytes + self.index.nbytes + self.edge_bounds.nbytes + self.segment_bounds.nbytes
+        total += 16 * len(self.edges)  # Segment points kept as Python lists, roughly
+        if self.distance_field is not None:
+            total += self.distance_field.nbytes
+        if self.centerline is not None:
+            total += self.centerline.nbytes
+        return total
+
+    def use(self, other):
+        """
+        Make this track an alias of another loaded track without rebuilding anything.
+
+        Only the segment list is copied, so drawing on this track afterwards
+        cannot change `other`; every other array is shared and only ever
+        replaced, never modified in place.
+
+        Args:
+            other (TrackGeometry): The track to switch to.
+        """
+        self.segments = list(other.segments)
+        self.cell_size = other.cell_size
+        self.edges = other.edges
+        self.index = other.index
+        self.segment_offsets = other.segment_offsets
+        self.edge_bounds = other.edge_bounds
+        self.segment_bounds = other.segment_bounds
+        self.field_resolution = other.field_resolution
+        self.distance_field = other.distance_field
+        self.centerline = other.centerline
+        self.start_point = other.start_point
+        self.end_point = other.end_point
+        self.save_file = other.save_file
+
+    def get_centerline(self):
+        """
+        Get the driving line used to measure progress along the track.
+
+        Uses the centerline saved in the track file if there is one, otherwise
+        traces it from the start point once and keeps it.
+
+        Returns:
+            Centerline: The track's centerline.
+
+        Raises:
+            ValueError: If the track has no saved centerline and tracing fails.
+        """
+        if self.centerline is None:
+            self.centerline = trace_centerline(self.edges, self.start_point)
+        return self.centerline
+
+    def get_track_data(self):
+        """
+        Get the loaded track data.
+
+        Cars query the walls through this dict: `index` (an `EdgeGrid`) gives
+        candidate edge ids for rays and boxes, and the bounds arrays cull
+        them further, as in `CarPhysics._candidate_edges`.
+
+        Returns:
+            dict: The track data (segments, edges, index, broad-phase bounds,
+                distance_field, start_point, end_point).
+        """
+        return {
+            "segments": self.segments,
+            "edges": self.edges,
+            "index": self.index,
+            "segment_offsets": self.segment_offsets,
+            "edge_bounds": self.edge_bounds,
+            "segment_bounds": self.segment_bounds,
+            "distance_field": self.distance_field,
+            "start_point": self.start_point,
+            "end_point": self.end_point,
+        }
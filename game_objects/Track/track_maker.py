@@ -2,7 +2,7 @@ import pyglet
 from pyglet.window import mouse, key
 import json
 from pyglet import shapes
-import numpy as np
+from spline import smooth_points  # Resolved from this script's directory
 
 # Constants
 WINDOW_WIDTH = 1600
@@ -19,7 +19,7 @@ batch = pyglet.graphics.Batch()
 track_points = []  # Current segment points
 finalized_segments = []  # All finalized track segments (list of point lists)
 temp_line = None  # Temporary line being drawn in real-time
-permanent_lines = []  # List of all permanent line objects
+permanent_lines = []  # Line objects per finalized segment, parallel to finalized_segments
 start_marker = None
 end_marker = None
 start_point = None
@@ -33,54 +33,16 @@ def add_point(x, y):
         track_points.append((x, y))
 
 
-# Smooth points
-def smooth_points(points, granularity):
-    """Smooth points into a curve using Catmull-Rom splines."""
-    if len(points) < 3:
-        return points  # Not enough points to smooth
-
-    points = np.array(points)
-    smoothed = []
-    for i in range(1, len(points) - 2):
-        p0, p1, p2, p3 = points[i - 1], points[i], points[i + 1], points[i + 2]
-
-        for t in np.linspace(0, 1, granularity):
-            t2 = t * t
-            t3 = t2 * t
-
-            x = 0.5 * (
-                (2 * p1[0]) +
-                (-p0[0] + p2[0]) * t +
-                (2 * p0[0] - 5 * p1[0] + 4 * p2[0] - p3[0]) * t2 +
-                (-p0[0] + 3 * p1[0] - 3 * p2[0] + p3[0]) * t3
-            )
-
-            y = 0.5 * (
-                (2 * p1[1]) +
-                (-p0[1] + p2[1]) * t +
-                (2 * p0[1] - 5 * p1[1] + 4 * p2[1] - p3[1]) * t2 +
-                (-p0[1] + 3 * p1[1] - 3 * p2[1] + p3[1]) * t3
-            )
-
-            smoothed.append((x, y))
-    return smoothed
-
-
-# Update permanent lines
-def update_permanent_lines():
-    """Re-render all finalized lines."""
-    global permanent_lines
-    for line in permanent_lines:
-        line.delete()
-    permanent_lines = []
-
-    for segment in finalized_segments:
-        smoothed = smooth_points(segment, smoothing_level)
-        for i in range(len(smoothed) - 1):
-            x1, y1 = smoothed[i]
-            x2, y2 = smoothed[i + 1]
-            line = shapes.Line(x1, y1, x2, y2, 2, color=(255, 255, 255), batch=batch)
-            permanent_lines.append(line)
+# Build the smoothed line shapes of one segment
+def create_segment_lines(segment):
+    """Smooth a single finalized segment and create its line shapes."""
+    smoothed = smooth_points(segment, smoothing_level)
+    lines = []
+    for i in range(len(smoothed) - 1):
+        x1, y1 = smoothed[i]
+        x2, y2 = smoothed[i + 1]
+        lines.append(shapes.Line(x1, y1, x2, y2, 2, color=(255, 255, 255), batch=batch))
+    return lines
 
 
 # Calculate the distance between two points
@@ -111,8 +73,8 @@ def on_mouse_release(x, y, button, modifiers):
             temp_line = None
         if len(track_points) > 1:
             finalized_segments.append(track_points[:])
+            permanent_lines.append(create_segment_lines(finalized_segments[-1]))
         track_points.clear()
-        update_permanent_lines()
 
 
 @window.event
@@ -165,7 +127,8 @@ def undo_last_segment():
     global finalized_segments
     if len(finalized_segments) > 0:
         finalized_segments.pop()
-        update_permanent_lines()
+        for line in permanent_lines.pop():
+            line.delete()
 
 
 # Reset the track
@@ -173,8 +136,9 @@ def reset_track():
     global track_points, finalized_segments, start_marker, end_marker, temp_line, permanent_lines
     track_points.clear()
     finalized_segments.clear()
-    for line in permanent_lines:
-        line.delete()
+    for lines in permanent_lines:
+        for line in lines:
+            line.delete()
     permanent_lines = []
     if start_marker:
         start_marker.delete()
@@ -0,0 +1,119 @@
+import glob
+import os
+from collections import OrderedDict
+
+from game_objects.Track.track_geometry import TrackGeometry
+
+
+class TrackRegistry:
+    def __init__(self, directory="game_objects/Track", max_bytes=256 * 1024 ** 2, cell_size=32.0,
+                 field_resolution=None):
+        """
+        Catalogue of the tracks in a folder with an LRU cache of loaded geometry.
+
+        Each track is parsed and indexed once; later requests return the same
+        `TrackGeometry`, so switching tracks between episodes costs a dict
+        lookup. Once the cached tracks hold more than `max_bytes`, the least
+        recently used ones are dropped and reloaded on their next use. The
+        track requested last is always kept, even if it alone exceeds the cap.
+
+        A track's centerline is traced while it is loaded, so the first
+        episode on a track does not stall. Tracks whose trace fails are
+        listed in `failed` and left out of `trainable_names`.
+
+        Args:
+            directory (str): Folder searched for `.json` and `.trk` tracks.
+            max_bytes (int): Memory cap of the cache, measured with `TrackGeometry.nbytes`.
+            cell_size (float): Spatial index cell size for every track.
+            field_resolution (float): Distance field spacing for every track, or None.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.cell_size = cell_size
+        self.field_resolution = field_resolution
+        self.paths = self._discover(directory)  # Track name -> file
+        self.cache = OrderedDict()  # Track name -> TrackGeometry, least recently used first
+        self.cached_bytes = 0
+        self.loads = 0  # Number of tracks parsed from disk so far
+        self.failed = {}  # Track name -> reason its centerline could not be traced
+
+    @staticmethod
+    def _discover(directory):
+        """
+        Map track names to files; a `.trk` wins over a `.json` of the same name.
+
+        Only JSON files that hold track segments are listed.
+        """
+        paths = {}
+        for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            with open(path, "r") as f:
+                if '"segments"' not in f.read(4096):
+                    continue
+            paths[os.path.splitext(os.path.basename(path))[0]] = path
+        for path in sorted(glob.glob(os.path.join(directory, "*.trk"))):
+            paths[os.path.splitext(os.path.basename(path))[0]] = path
+        return paths
+
+    @property
+    def names(self):
+        """Names of every track in the folder, sorted."""
+        return sorted(self.paths)
+
+    def trainable_names(self):
+        """
+        Names of the tracks an episode can be measured on, loading each one.
+
+        Returns:
+            list: Sorted names of tracks with a start point and a centerline.
+        """
+        return [name for name in self.names if self.get(name).start_point and name not in self.failed]
+
+    def get(self, name):
+        """
+        Get a track by name, loading it on first use.
+
+        Args:
+            name (str): Track file name without its extension.
+
+        Returns:
+            TrackGeometry: The cached track; treat it as read-only, since it
+                is shared with every other user of the registry.
+        """
+        track = self.cache.get(name)
+        if track is not None:
+            self.cache.move_to_end(name)
+            return track
+
+        track = TrackGeometry(self.paths[name], self.cell_size, self.field_resolution)
+        self.loads += 1
+        if track.start_point and name not in self.failed:
+            try:
+                track.get_centerline()
+            except ValueError as error:
+                print(f"Skipping the centerline of track {name}: {error}")
+                self.failed[name] = str(error)
+        self.cache[name] = track
+        self.cached_bytes += track.nbytes
+        self._evict()
+        return track
+
+    def preload(self, names=None):
+        """
+        Load tracks ahead of time, e.g. a whole curriculum before training.
+
+        Tracks beyond the memory cap are loaded and then evicted again, so
+        only the most recently listed ones stay cached.
+
+        Args:
+            names (list): Tracks to load; all of them if None.
+        """
+        for name in names or self.names:
+            self.get(name)
+
+    def _evict(self):
+        """Drop least recently used tracks until the cache fits its cap."""
+        # Tracing a centerline outside `get` grows a track, so recount before deciding
+        self.cached_bytes = sum(track.nbytes for track in self.cache.values())
+        while self.cached_bytes > self.max_bytes and len(self.cache) > 1:
+            _, track = self.cache.popitem(last=False)
+            self.cached_bytes -= track.nbytes
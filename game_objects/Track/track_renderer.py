@@ -0,0 +1,90 @@
+import numpy as np
+import pyglet
+from pyglet.gl import GL_LINES
+
+_vertex_source = """#version 330 core
+    in vec2 position;
+    in vec4 colors;
+    out vec4 vertex_colors;
+
+    uniform WindowBlock
+    {
+        mat4 projection;
+        mat4 view;
+    } window;
+
+    void main()
+    {
+        gl_Position = window.projection * window.view * vec4(position, 0.0, 1.0);
+        vertex_colors = colors;
+    }
+"""
+
+_fragment_source = """#version 330 core
+    in vec4 vertex_colors;
+    out vec4 final_colors;
+
+    void main()
+    {
+        final_colors = vertex_colors;
+    }
+"""
+
+
+def _get_line_program():
+    """Line shader for the current context (compiled once and cached by pyglet)."""
+    return pyglet.gl.current_context.create_program((_vertex_source, "vertex"), (_fragment_source, "fragment"))
+
+
+class TrackRenderer:
+    def __init__(self, batch, color=(255, 255, 255, 255)):
+        """
+        Draw every track edge from a single GL_LINES vertex list.
+
+        Replaces one `shapes.Line` per edge, so loading a track is one upload
+        and drawing it is one draw call regardless of track size. Lines are
+        drawn one pixel wide.
+
+        Args:
+            batch (pyglet.graphics.Batch): Batch the vertex list is added to.
+            color (tuple): RGBA line color (0-255).
+        """
+        self.batch = batch
+        self.color = color
+        self.program = _get_line_program()
+        self.group = pyglet.graphics.ShaderGroup(self.program)
+        self.vertex_list = None
+
+    def set_edges(self, edges):
+        """
+        Upload a new set of edges, replacing the previous ones.
+
+        The existing vertex list is rewritten in place when the edge count is
+        unchanged, and reallocated otherwise.
+
+        Args:
+            edges (np.ndarray): Track edges of shape (M, 4).
+        """
+        edges = np.asarray(edges, dtype=np.float32).reshape(-1, 4)
+        count = 2 * len(edges)
+        if count == 0:
+            self.delete()
+            return
+
+        positions = edges.ravel().tolist()
+        if self.vertex_list is not None and self.vertex_list.count == count:
+            self.vertex_list.position[:] = positions
+            return
+
+        self.delete()
+        self.vertex_list = self.program.vertex_list(
+            count, GL_LINES, batch=self.batch, group=self.group,
+            position=("f", positions),
+            colors=("Bn", self.color * count),
+        )
+
+    def delete(self):
+        """Free the vertex list."""
+        if self.vertex_list is not None:
+            self.vertex_list.delete()
+            self.vertex_list = None
@@ -0,0 +1,213 @@
+import numpy as np
+
+from game_objects import raycast
+from game_objects.car_physics import CarPhysics
+
+
+class CarFleet:
+    def __init__(self, num_cars, start_point, width, height, max_pairs=1 << 20):
+        """
+        Simulate many cars on the same track in lockstep with array-backed state.
+
+        Each car follows the same rules as `CarPhysics`; the tuning constants
+        and ray layout are taken from it so the two never drift apart.
+
+        Args:
+            num_cars (int): Number of cars to simulate.
+            start_point (tuple): (x, y) spawn point shared by all cars.
+            width (float): Length of each car body along its heading.
+            height (float): Width of each car body across its heading.
+            max_pairs (int): Upper bound on ray/edge pairs tested in one broadcast,
+                used to cap temporary memory on large fleets.
+        """
+        template = CarPhysics(start_point[0], start_point[1], width, height)
+        self.num_cars = num_cars
+        self.start_point = start_point
+        self.width = width
+        self.height = height
+        self.acceleration = template.acceleration
+        self.max_speed = template.max_speed
+        self.turn_speed = template.turn_speed
+        self.action_dt = template.action_dt
+        self.ray_length = template.ray_length
+        self.num_rays = template.num_rays
+        self.ray_offsets = np.radians(np.array(template.ray_angles[:self.num_rays], dtype=np.float64))
+        self.max_pairs = max_pairs
+
+        self.x = np.full(num_cars, float(start_point[0]))
+        self.y = np.full(num_cars, float(start_point[1]))
+        self.rotation = np.full(num_cars, float(template.rotation))  # Degrees
+        self.velocity = np.zeros(num_cars)
+
+    def reset(self, mask=None, start_point=None):
+        """
+        Move cars back to the start point.
+
+        Args:
+            mask (np.ndarray): Boolean mask of cars to reset; all cars if None.
+            start_point (tuple): Point to respawn at; the fleet's start point if None.
+        """
+        if mask is None:
+            mask = np.ones(self.num_cars, dtype=bool)
+        if start_point is None:
+            start_point = self.start_point
+        self.x[mask] = start_point[0]
+        self.y[mask] = start_point[1]
+        self.rotation[mask] = 90
+        self.velocity[mask] = 0
+
+    def perform_actions(self, actions):
+        """
+        Apply one discrete action per car, as in `CarPhysics.perform_action`.
+
+        Args:
+            actions (np.ndarray): Integer actions of shape (N,).
+        """
+        actions = np.asarray(actions)
+        self.velocity += self.acceleration * self.action_dt * ((actions == 0).astype(np.float64) - (actions == 1))
+        self.rotation += self.turn_speed * self.action_dt * ((actions == 2).astype(np.float64) - (actions == 3))
+
+    def get_corners(self):
+        """
+        Calculate the four corners of every car.
+
+        Returns:
+            np.ndarray: Shape (N, 4, 2), ordered top-right, top-left, bottom-left, bottom-right.
+        """
+        radians = np.radians(self.rotation)
+        cos = np.cos(radians)[:, None]
+        sin = np.sin(radians)[:, None]
+        dx = np.array([1, -1, -1, 1]) * (self.width / 2)
+        dy = np.array([1, 1, -1, -1]) * (self.height / 2)
+        corners_x = self.x[:, None] + cos * dx - sin * dy
+        corners_y = self.y[:, None] + sin * dx + cos * dy
+        return np.stack((corners_x, corners_y), axis=-1)
+
+    def cast_rays(self, track_data):
+        """
+        Cast every ray of every car against the track.
+
+        Args:
+            track_data (dict): Track data from `TrackGeometry.get_track_data`.
+
+        Returns:
+            np.ndarray: Distances of shape (N, num_rays).
+        """
+        angles = (np.radians(self.rotation)[:, None] + self.ray_offsets).ravel()
+        origin_x = np.repeat(self.x, self.num_rays)
+        origin_y = np.repeat(self.y, self.num_rays)
+        ray_x = np.cos(angles) * self.ray_length
+        ray_y = np.sin(angles) * self.ray_length
+
+        edges = self._candidate_edges(track_data, lambda index: index.query_rays(
+            origin_x, origin_y, origin_x + ray_x, origin_y + ray_y))
+
+        t = np.empty(len(angles))
+        for rows in self._chunks(len(angles), len(edges)):
+            t[rows] = raycast.ray_hit_fractions(origin_x[rows], origin_y[rows], ray_x[rows], ray_y[rows], edges)
+        return (t * self.ray_length).reshape(self.num_cars, self.num_rays)
+
+    def check_collisions(self, track_data, dx=None, dy=None):
+        """
+        Check which cars touch a track edge, now or while translating by (dx, dy).
+
+        With a translation, every corner is also swept as a ray against the
+        track and the cars are tested again at their end poses, so cars cannot
+        tunnel through walls on long steps. Unlike `CarPhysics.check_collision`
+        this does not sweep wall endpoints back against each car, so a wall tip
+        that passes right through a car without reaching a corner path or the
+        end pose is missed; that needs a step longer than the car itself.
+
+        Args:
+            track_data (dict): Track data from `TrackGeometry.get_track_data`.
+            dx (np.ndarray): Per-car translation x of shape (N,), or None.
+            dy (np.ndarray): Per-car translation y of shape (N,), or None.
+
+        Returns:
+            np.ndarray: Boolean mask of shape (N,).
+        """
+        corners = self.get_corners()
+        moving = dx is not None and dy is not None
+        sweep = np.column_stack((dx, dy))[:, None, :] if moving else np.zeros((self.num_cars, 1, 2))
+        end_corners = corners + sweep
+
+        low = np.minimum(corners.min(axis=1), end_corners.min(axis=1))
+        high = np.maximum(corners.max(axis=1), end_corners.max(axis=1))
+        edges = self._candidate_edges(track_data, lambda index: index.query_boxes(
+            low[:, 0], low[:, 1], high[:, 0], high[:, 1]))
+
+        hit = self._overlaps(corners, edges)
+        if moving:
+            hit |= self._overlaps(end_corners, edges)
+            origins = corners.reshape(-1, 2)
+            rays = np.broadcast_to(sweep, corners.shape).reshape(-1, 2)
+            t = np.ones(len(origins))
+            for rows in self._chunks(len(origins), len(edges)):
+                t[rows] = raycast.ray_hit_fractions(origins[rows, 0], origins[rows, 1], rays[rows, 0], rays[rows, 1],
+                                                    edges)
+            hit |= (t < 1.0).reshape(self.num_cars, 4).any(axis=1)
+        return hit
+
+    def _overlaps(self, corners, edges):
+        """Which cars with corners of shape (N, 4, 2) have a side crossing any edge."""
+        car_edges = np.concatenate((corners, np.roll(corners, -1, axis=1)), axis=-1).reshape(-1, 4)
+        hit = np.zeros(len(car_edges), dtype=bool)
+        for rows in self._chunks(len(car_edges), len(edges)):
+            hit[rows] = raycast.segments_intersect(car_edges[rows], edges).any(axis=1)
+        return hit.reshape(self.num_cars, 4).any(axis=1)
+
+    def get_states(self, distances):
+        """
+        Build the controller input for every car.
+
+        Args:
+            distances (np.ndarray): Ray distances of shape (N, num_rays).
+
+        Returns:
+            np.ndarray: States of shape (N, num_rays + 1): ray distances then velocity.
+        """
+        return np.column_stack((distances, self.velocity))
+
+    def step(self, dt, track_data, ai_controller):
+        """
+        Advance every car by one frame, mirroring `CarPhysics.update` with an AI controller.
+
+        Args:
+            dt (float): Time step in seconds.
+            track_data (dict): Track data from `TrackGeometry.get_track_data`.
+            ai_controller: Object with a `get_actions(states)` method returning (N,) actions.
+
+        Returns:
+            tuple: (states, actions, collided) for the frame.
+        """
+        states = self.get_states(self.cast_rays(track_data))
+        actions = np.asarray(ai_controller.get_actions(states))
+        self.perform_actions(actions)
+
+        radians = np.radians(self.rotation)
+        dx = np.cos(radians) * self.velocity * dt
+        dy = np.sin(radians) * self.velocity * dt
+
+        # Cars that stay clear over the whole step move on, cars touching a wall restart
+        collided = self.check_collisions(track_data, dx, dy)
+        self.x = np.where(collided, self.x, self.x + dx)
+        self.y = np.where(collided, self.y, self.y + dy)
+        if track_data.get("start_point"):
+            self.reset(collided, track_data["start_point"])
+        return states, actions, collided
+
+    def _candidate_edges(self, track_data, query):
+        """Narrow the track edges with the spatial index when one is available."""
+        edges = track_data.get("edges")
+        if edges is None:
+            edges = raycast.segments_to_edges(track_data["segments"])
+        index = track_data.get("index")
+        if index is not None:
+            edges = edges[query(index)]
+        return edges
+
+    def _chunks(self, num_rows, num_edges):
+        """Yield row slices so that each broadcast stays under `max_pairs` pairs."""
+        size = max(1, self.max_pairs // max(1, num_edges))
+        for start in range(0, num_rows, size):
+            yield slice(start, start + size)
@@ -0,0 +1,435 @@
+import math
+import struct
+import numpy as np
+
+from game_objects import raycast
+from profiler import NULL_PROFILER
+
+
+class CarPhysics:
+    __slots__ = (
+        "x", "y", "_rotation", "_basis", "velocity", "acceleration", "max_speed", "friction", "turn_speed",
+        "action_dt", "width", "height", "ray_length", "num_rays", "ray_angles", "_ray_offsets",
+        "hits", "stats", "trace_distance_field", "time_of_impact", "substep_distance", "last_action", "profiler",
+    )
+
+    def __init__(self, x, y, width, height):
+        """
+        Headless car model: motion, ray sensing and collision without any rendering.
+
+        Args:
+            x (float): Initial x position.
+            y (float): Initial y position.
+            width (float): Length of the car body along its heading.
+            height (float): Width of the car body across its heading.
+        """
+        self.x = x
+        self.y = y
+        self.rotation = 90  # Angle in degrees
+        self.velocity = 0  # Current speed
+        self.acceleration = 300  # Acceleration rate (pixels per second squared)
+        self.max_speed = 600  # Maximum speed (pixels per second)
+        self.friction = 200  # Friction to slow down the car when no input
+        self.turn_speed = 120  # Turning speed (degrees per second)
+        self.action_dt = 0.1  # Seconds of input applied by one discrete AI action
+
+        self.width = width
+        self.height = height
+
+        self.ray_length = 400  # Max distance the rays can reach
+        self.num_rays = 8  # Rays distributed around the car
+        self.ray_angles = [0, 45, -45, 90, -90, 135, -135, 180]  # Degrees, relative to the car's rotation
+        offsets = np.radians(np.array(self.ray_angles[:self.num_rays], dtype=np.float64))
+        self._ray_offsets = np.column_stack((np.cos(offsets), np.sin(offsets)))  # (cos, sin) of each ray offset
+        self.hits = np.full((self.num_rays, 2), np.nan)  # Last ray intersection points
+        self.stats = {"narrow_tests": 0, "culled_tests": 0}  # Segment tests run / skipped by the broad phase
+        self.trace_distance_field = False  # Sphere-trace rays through the track's distance field if it has one
+        self.time_of_impact = 1.0  # Fraction of the last step completed before touching a wall
+        self.substep_distance = None  # If set, split manual-input steps that travel further than this
+
+        self.last_action = None  # Last action taken by AI
+        self.profiler = NULL_PROFILER  # Receives per-phase timings and counters from update()
+
+    @property
+    def rotation(self):
+        """Heading in degrees."""
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, rotation):
+        self._rotation = rotation
+        self._basis = None
+
+    def heading_basis(self):
+        """
+        Unit vector along the car's heading.
+
+        Computed once per change of `rotation` and shared by motion, corner
+        generation and ray directions.
+
+        Returns:
+            tuple: (cos, sin) of the rotation.
+        """
+        if self._basis is None:
+            radians = math.radians(self._rotation)
+            self._basis = (math.cos(radians), math.sin(radians))
+        return self._basis
+
+    @classmethod
+    def from_image_file(cls, x, y, image_path="resources/car.png", scale=0.2):
+        """
+        Create a car with the same collision box as a `Car` using that sprite.
+
+        Only the PNG header is read, so no display or GL context is needed.
+
+        Args:
+            x (float): Initial x position.
+            y (float): Initial y position.
+            image_path (str): Path to the car PNG.
+            scale (float): Sprite scale the car would be drawn at.
+
+        Returns:
+            CarPhysics: The headless car.
+        """
+        with open(image_path, "rb") as f:
+            header = f.read(24)
+        width, height = struct.unpack(">II", header[16:24])
+        return cls(x, y, width * scale, height * scale)
+
+    def perform_action(self, action):
+        """Perform an action based on AI's decision."""
+        if action == 0:  # Accelerate
+            self.velocity += self.acceleration * self.action_dt
+        elif action == 1:  # Decelerate
+            self.velocity -= self.acceleration * self.action_dt
+        elif action == 2:  # Turn left
+            self.rotation += self.turn_speed * self.action_dt
+        elif action == 3:  # Turn right
+            self.rotation -= self.turn_speed * self.action_dt
+
+    def apply_manual_input(self, keys, dt):
+        """Apply manual control based on key inputs."""
+        if keys.get('up', False):
+            self.velocity += self.acceleration * dt
+        elif keys.get('down', False):
+            self.velocity -= self.acceleration * dt
+        else:
+            # Apply friction
+            if self.velocity > 0:
+                self.velocity = max(0, self.velocity - self.friction * dt)
+            elif self.velocity < 0:
+                self.velocity = min(0, self.velocity + self.friction * dt)
+
+        # Limit velocity to max speed
+        self.velocity = max(-self.max_speed, min(self.max_speed, self.velocity))
+
+        # Steering logic
+        if abs(self.velocity) > 0:  # Only turn if the car is moving
+            if keys.get('left', False):
+                self.rotation += self.turn_speed * dt * (-1 if self.velocity < 0 else 1)
+            if keys.get('right', False):
+                self.rotation -= self.turn_speed * dt * (-1 if self.velocity < 0 else 1)
+
+    def get_corners(self):
+        """
+        Calculate the four corners of the rotated car rectangle.
+
+        Returns:
+            np.ndarray: Shape (4, 2), ordered top-right, top-left, bottom-left, bottom-right.
+        """
+        cos, sin = self.heading_basis()
+        # Half-length along the heading and half-width across it
+        ax, ay = cos * self.width / 2, sin * self.width / 2
+        bx, by = -sin * self.height / 2, cos * self.height / 2
+        x, y = self.x, self.y
+        return np.array((
+            (x + ax + bx, y + ay + by),  # Top-right
+            (x - ax + bx, y - ay + by),  # Top-left
+            (x - ax - bx, y - ay - by),  # Bottom-left
+            (x + ax - bx, y + ay - by),  # Bottom-right
+        ))
+
+    def ray_vectors(self):
+        """
+        Unit direction of every ray, from the heading and the precomputed offset rotations.
+
+        Returns:
+            np.ndarray: Shape (num_rays, 2).
+        """
+        cos, sin = self.heading_basis()
+        return self._ray_offsets @ np.array(((cos, sin), (-sin, cos)))
+
+    def cast_rays(self, track_data):
+        """
+        Cast rays outward from the car and measure the distance to the nearest edge.
+
+        The intersection points are kept in `self.hits` for the view layer.
+
+        Args:
+            track_data (dict): Contains 'segments' of the track for collision detection.
+
+        Returns:
+            list: Distances to the nearest obstacle for each ray.
+        """
+        directions = self.ray_vectors()
+
+        distance_field = track_data.get("distance_field")
+        if self.trace_distance_field and distance_field is not None:
+            distances = distance_field.trace_rays(self.x, self.y, None, self.ray_length, directions=directions)
+            self.hits = np.column_stack((self.x + directions[:, 0] * distances, self.y + directions[:, 1] * distances))
+            self.hits[distances >= self.ray_length] = np.nan
+            return distances.tolist()
+
+        ray_x = directions[:, 0] * self.ray_length
+        ray_y = directions[:, 1] * self.ray_length
+        end_x = self.x + ray_x
+        end_y = self.y + ray_y
+        ray_boxes = np.column_stack((
+            np.minimum(self.x, end_x), np.minimum(self.y, end_y), np.maximum(self.x, end_x), np.maximum(self.y, end_y),
+        ))
+        # Only edges in grid cells crossed by a ray can be hit
+        edges = self._candidate_edges(
+            track_data, ray_boxes, len(directions), lambda index: index.query_rays(self.x, self.y, end_x, end_y))
+
+        # Test every ray against every candidate edge in one batch
+        t = raycast.ray_hit_fractions(self.x, self.y, ray_x, ray_y, edges)
+        self.hits = np.column_stack((self.x + ray_x * t, self.y + ray_y * t))
+        self.hits[t >= 1.0] = np.nan
+        return (t * self.ray_length).tolist()
+
+    def cast_rays_scalar(self, track_data):
+        """
+        Reference implementation of the ray distances using `line_intersection`.
+
+        Kept for validating the batched caster.
+
+        Args:
+            track_data (dict): Contains 'segments' of the track for collision detection.
+
+        Returns:
+            list: Distances to the nearest obstacle for each ray.
+        """
+        segments = track_data["segments"]
+        distances = []
+
+        for i in range(self.num_rays):
+            angle = math.radians(self.rotation + self.ray_angles[i])
+            end_x = self.x + math.cos(angle) * self.ray_length
+            end_y = self.y + math.sin(angle) * self.ray_length
+            min_distance = self.ray_length
+
+            for segment in segments:
+                for j in range(len(segment) - 1):
+                    x1, y1 = segment[j]
+                    x2, y2 = segment[j + 1]
+                    intersection = self.line_intersection(self.x, self.y, end_x, end_y, x1, y1, x2, y2)
+                    if intersection:
+                        dist = math.sqrt((intersection[0] - self.x) ** 2 + (intersection[1] - self.y) ** 2)
+                        min_distance = min(min_distance, dist)
+
+            distances.append(min_distance)
+
+        return distances
+
+    @staticmethod
+    def line_intersection(x1, y1, x2, y2, x3, y3, x4, y4):
+        """Check if two line segments intersect and return the intersection point."""
+        def det(a, b, c, d):
+            return a * d - b * c
+
+        denom = det(x1 - x2, y1 - y2, x3 - x4, y3 - y4)
+        if denom == 0:
+            return None  # Lines are parallel
+
+        px = det(det(x1, y1, x2, y2), x1 - x2, det(x3, y3, x4, y4), x3 - x4) / denom
+        py = det(det(x1, y1, x2, y2), y1 - y2, det(x3, y3, x4, y4), y3 - y4) / denom
+
+        if min(x1, x2) <= px <= max(x1, x2) and min(y1, y2) <= py <= max(y1, y2) and \
+           min(x3, x4) <= px <= max(x3, x4) and min(y3, y4) <= py <= max(y3, y4):
+            return px, py
+        return None
+
+    def reset(self, start_point):
+        """Reset the car to the start position and reset its rotation."""
+        self.x, self.y = start_point
+        self.rotation = 90
+        self.velocity = 0
+
+    def check_collision(self, track_data, dx=0.0, dy=0.0):
+        """
+        Check if the car collides with the track, now or while translating by (dx, dy).
+
+        The translation is swept continuously, so a step longer than the car
+        cannot tunnel through a thin wall. The fraction of the step at which
+        the car first touches a wall is kept in `self.time_of_impact`.
+
+        Args:
+            track_data (dict): Contains 'segments' of the track for collision detection.
+            dx (float): Translation x over the step.
+            dy (float): Translation y over the step.
+
+        Returns:
+            bool: True if the car touches a wall at its current pose or along the sweep.
+        """
+        corners = self.get_corners()
+        moving = dx != 0 or dy != 0
+
+        # A baked distance field turns the test into a few array lookups
+        distance_field = track_data.get("distance_field")
+        if distance_field is not None:
+            collided = distance_field.collides(corners, (dx, dy))
+            self.time_of_impact = 0.0 if collided else 1.0
+            return collided
+
+        car_edges = np.hstack((corners, np.roll(corners, -1, axis=0)))  # Top, left, bottom, right
+
+        # Only edges registered near the box swept by the car can touch it
+        low = corners.min(axis=0) + np.minimum((dx, dy), 0)
+        high = corners.max(axis=0) + np.maximum((dx, dy), 0)
+        box = np.concatenate((low, high))
+        # Four side tests, plus four corner rays and eight endpoint rays per edge when sweeping
+        num_queries = len(car_edges) * (4 if moving else 1)
+        edges = self._candidate_edges(track_data, box, num_queries, lambda index: index.query_box(*box))
+
+        if raycast.segments_intersect(car_edges, edges).any():
+            self.time_of_impact = 0.0
+            return True
+        self.time_of_impact = raycast.swept_hit_fraction(corners, dx, dy, edges) if moving else 1.0
+        return self.time_of_impact < 1.0
+
+    def _candidate_edges(self, track_data, boxes, num_queries, index_query):
+        """
+        Select the track edges worth a narrow-phase test against some query shapes.
+
+        The spatial index narrows the search when the track has one; otherwise
+        whole polylines whose box misses every query box are skipped. Either
+        way, single edges whose box misses every query box are then dropped.
+        `self.stats` counts the tests that remain and the ones avoided compared
+        with testing every track edge.
+
+        Args:
+            track_data (dict): Contains 'segments' of the track, plus optional
+                'edges', 'index' and broad-phase bounds.
+            boxes (np.ndarray): Query bounding boxes, shape (B, 4).
+            num_queries (int): Number of rays or car edges tested per track edge.
+            index_query (callable): Maps the spatial index to candidate edge ids.
+
+        Returns:
+            np.ndarray: Candidate edges of shape (K, 4).
+        """
+        edges = track_data.get("edges")
+        if edges is None:
+            edges = raycast.segments_to_edges(track_data["segments"])
+
+        index = track_data.get("index")
+        segment_bounds = track_data.get("segment_bounds")
+        if index is not None:
+            ids = index_query(index)
+        elif segment_bounds is not None:
+            offsets = track_data["segment_offsets"]
+            keep = np.flatnonzero(raycast.overlaps_any(segment_bounds, boxes))
+            ids = np.concatenate([np.arange(offsets[k], offsets[k + 1]) for k in keep] or [np.empty(0, np.int64)])
+        else:
+            ids = np.arange(len(edges))
+
+        bounds = track_data.get("edge_bounds")
+        if bounds is not None:
+            ids = ids[raycast.overlaps_any(bounds[ids], boxes)]
+
+        self.stats["narrow_tests"] += num_queries * len(ids)
+        self.stats["culled_tests"] += num_queries * (len(edges) - len(ids))
+        return edges[ids]
+
+    def reset_stats(self):
+        """Zero the broad-phase counters, e.g. at the start of a frame."""
+        self.stats["narrow_tests"] = 0
+        self.stats["culled_tests"] = 0
+
+    def get_state(self, track_data):
+        """
+        Build the AI controller input: the ray distances followed by the velocity.
+
+        Args:
+            track_data (dict): Contains 'segments' of the track for collision detection.
+
+        Returns:
+            tuple: State of length num_rays + 1.
+        """
+        return tuple(self.cast_rays(track_data) + [self.velocity])
+
+    def move(self, dt, track_data):
+        """
+        Advance the car along its heading, or reset it if it touches the track.
+
+        Args:
+            dt (float): Time step in seconds.
+            track_data (dict): Contains 'segments' and 'start_point' of the track.
+
+        Returns:
+            bool: True if the car collided this step.
+        """
+        # Calculate the step
+        cos, sin = self.heading_basis()
+        dx = cos * self.velocity * dt
+        dy = sin * self.velocity * dt
+
+        # Check for collisions along the whole step
+        with self.profiler.section("collision"):
+            collided = self.check_collision(track_data, dx, dy)
+        if not collided:
+            self.x += dx
+            self.y += dy
+            return False
+
+        # Collision detected, reset car
+        if "start_point" in track_data and track_data["start_point"]:
+            self.reset(track_data["start_point"])
+        return True
+
+    def update(self, dt, keys, track_data, ai_controller=None):
+        """
+        Update the car's position and handle collision detection.
+
+        Returns:
+            bool: True if the car collided this step.
+        """
+        self.reset_stats()
+        profiler = self.profiler
+        if ai_controller:
+            with profiler.section("rays"):
+                state = self.get_state(track_data)
+            with profiler.section("action"):
+                action = ai_controller.get_action(state)
+            profiler.count("model_calls")
+            with profiler.section("physics"):
+                self.perform_action(action)
+            self.last_action = action
+            collided = self.move(dt, track_data)
+        else:
+            # Manual input changes speed and heading within a step, so long steps are split up
+            substeps = self.num_substeps(dt)
+            for _ in range(substeps):
+                with profiler.section("physics"):
+                    self.apply_manual_input(keys, dt / substeps)
+                collided = self.move(dt / substeps, track_data)
+                if collided:
+                    break
+
+        profiler.count("narrow_tests", self.stats["narrow_tests"])
+        profiler.count("culled_tests", self.stats["culled_tests"])
+        return collided
+
+    def num_substeps(self, dt):
+        """
+        Number of sub-steps needed so none travels further than `substep_distance`.
+
+        Args:
+            dt (float): Full time step in seconds.
+
+        Returns:
+            int: 1 when sub-stepping is off or the car is slow enough.
+        """
+        if not self.substep_distance:
+            return 1
+        reach = (abs(self.velocity) + self.acceleration * dt) * dt
+        return max(1, math.ceil(reach / self.substep_distance))
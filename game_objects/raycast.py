@@ -0,0 +1,196 @@
+import numpy as np
+
+
+def segments_to_edges(segments):
+    """
+    Flatten track polylines into a single array of edges.
+
+    Args:
+        segments (list): A list of polylines, each a list of (x, y) points.
+
+    Returns:
+        np.ndarray: Array of shape (M, 4) holding (x1, y1, x2, y2) per edge.
+    """
+    edges = []
+    for segment in segments:
+        if len(segment) < 2:
+            continue
+        points = np.asarray(segment, dtype=np.float64)
+        edges.append(np.hstack((points[:-1], points[1:])))
+    if not edges:
+        return np.empty((0, 4), dtype=np.float64)
+    return np.vstack(edges)
+
+
+def edge_bounds(edges):
+    """
+    Axis-aligned bounding box of every edge.
+
+    Args:
+        edges (np.ndarray): Edges of shape (M, 4).
+
+    Returns:
+        np.ndarray: Shape (M, 4) holding (xmin, ymin, xmax, ymax) per edge.
+    """
+    return np.hstack((np.minimum(edges[:, 0:2], edges[:, 2:4]), np.maximum(edges[:, 0:2], edges[:, 2:4])))
+
+
+def polyline_bounds(bounds, offsets):
+    """
+    Merge per-edge boxes into one box per polyline.
+
+    Args:
+        bounds (np.ndarray): Edge boxes of shape (M, 4) from `edge_bounds`.
+        offsets (np.ndarray): Polyline boundaries of shape (S + 1,); edges of
+            polyline k are `offsets[k]:offsets[k + 1]`.
+
+    Returns:
+        np.ndarray: Shape (S, 4) holding (xmin, ymin, xmax, ymax) per polyline.
+    """
+    if len(offsets) < 2:
+        return np.empty((0, 4))
+    starts = np.asarray(offsets[:-1])
+    return np.hstack((np.minimum.reduceat(bounds[:, 0:2], starts), np.maximum.reduceat(bounds[:, 2:4], starts)))
+
+
+def overlaps_any(bounds, boxes):
+    """
+    Cheap broad-phase reject: which boxes in `bounds` touch any box in `boxes`.
+
+    Args:
+        bounds (np.ndarray): Boxes to filter, shape (K, 4) as (xmin, ymin, xmax, ymax).
+        boxes (np.ndarray): Query boxes, shape (B, 4).
+
+    Returns:
+        np.ndarray: Boolean mask of shape (K,).
+    """
+    boxes = np.asarray(boxes).reshape(-1, 4)
+    return ((bounds[:, None, 0] <= boxes[:, 2]) & (bounds[:, None, 2] >= boxes[:, 0])
+            & (bounds[:, None, 1] <= boxes[:, 3]) & (bounds[:, None, 3] >= boxes[:, 1])).any(axis=1)
+
+
+def cast_rays(x, y, angles, ray_length, edges):
+    """
+    Cast all rays against all edges in one broadcast.
+
+    Args:
+        x (float): Ray origin x coordinate.
+        y (float): Ray origin y coordinate.
+        angles (np.ndarray): Absolute ray angles in radians, shape (R,).
+        ray_length (float): Maximum distance a ray can reach.
+        edges (np.ndarray): Track edges, shape (M, 4).
+
+    Returns:
+        tuple: (distances, hits) where distances has shape (R,) and is
+            ray_length for rays that hit nothing, and hits is an (R, 2) array
+            of intersection points (NaN where there is no hit).
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    rx = np.cos(angles) * ray_length
+    ry = np.sin(angles) * ray_length
+    t = ray_hit_fractions(x, y, rx, ry, edges)
+
+    distances = t * ray_length
+    hits = np.full((len(angles), 2), np.nan)
+    hit = t < 1.0
+    hits[hit, 0] = x + rx[hit] * t[hit]
+    hits[hit, 1] = y + ry[hit] * t[hit]
+    return distances, hits
+
+
+def ray_hit_fractions(x, y, rx, ry, edges):
+    """
+    Find the nearest hit along each ray as a fraction of the ray vector.
+
+    Args:
+        x (float or np.ndarray): Ray origin x, scalar or shape (R,).
+        y (float or np.ndarray): Ray origin y, scalar or shape (R,).
+        rx (np.ndarray): Ray vector x components, shape (R,).
+        ry (np.ndarray): Ray vector y components, shape (R,).
+        edges (np.ndarray): Track edges, shape (M, 4).
+
+    Returns:
+        np.ndarray: Shape (R,), the smallest t in [0, 1] where ray R hits an
+            edge, or 1.0 if it hits nothing.
+    """
+    rx = np.asarray(rx, dtype=np.float64)[:, None]
+    ry = np.asarray(ry, dtype=np.float64)[:, None]
+    ox = np.broadcast_to(np.asarray(x, dtype=np.float64), rx.shape[:1])[:, None]
+    oy = np.broadcast_to(np.asarray(y, dtype=np.float64), ry.shape[:1])[:, None]
+    if len(edges) == 0:
+        return np.ones(rx.shape[0])
+
+    x1, y1, x2, y2 = edges[:, 0], edges[:, 1], edges[:, 2], edges[:, 3]
+    sx = x2 - x1
+    sy = y2 - y1
+
+    # Solve origin + t * ray == (x1, y1) + u * seg for every ray/edge pair
+    denom = rx * sy - ry * sx
+    qx = x1 - ox
+    qy = y1 - oy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (qx * sy - qy * sx) / denom
+        u = (qx * ry - qy * rx) / denom
+
+    valid = (denom != 0) & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+    t = np.where(valid, t, 1.0)
+    return t.min(axis=1)
+
+
+def segments_intersect(a, b):
+    """
+    Test every segment in `a` against every segment in `b`.
+
+    Args:
+        a (np.ndarray): Segments of shape (A, 4).
+        b (np.ndarray): Segments of shape (B, 4).
+
+    Returns:
+        np.ndarray: Boolean matrix of shape (A, B).
+    """
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=bool)
+
+    px, py = a[:, 0:1], a[:, 1:2]
+    rx, ry = a[:, 2:3] - px, a[:, 3:4] - py
+    qx, qy = b[:, 0] - px, b[:, 1] - py
+    sx, sy = b[:, 2] - b[:, 0], b[:, 3] - b[:, 1]
+
+    denom = rx * sy - ry * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (qx * sy - qy * sx) / denom
+        u = (qx * ry - qy * rx) / denom
+    return (denom != 0) & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+
+
+def swept_hit_fraction(corners, dx, dy, edges):
+    """
+    Time of impact of a polygon translating by (dx, dy) against track edges.
+
+    A translating polygon first touches an edge either when one of its corners
+    crosses the edge, or when an endpoint of the edge crosses one of its
+    sides. Both cases are ray casts: forward from every corner against the
+    edges, and backward from every edge endpoint against the polygon sides.
+
+    Args:
+        corners (np.ndarray): Polygon corners of shape (C, 2), in order.
+        dx (float): Translation x.
+        dy (float): Translation y.
+        edges (np.ndarray): Track edges, shape (M, 4).
+
+    Returns:
+        float: Smallest fraction in [0, 1] of the translation at which the
+            polygon touches an edge, or 1.0 if it stays clear.
+    """
+    if len(edges) == 0 or (dx == 0 and dy == 0):
+        return 1.0
+    num_corners = len(corners)
+    t_corners = ray_hit_fractions(corners[:, 0], corners[:, 1], np.full(num_corners, dx), np.full(num_corners, dy),
+                                  edges)
+
+    sides = np.hstack((corners, np.roll(corners, -1, axis=0)))
+    endpoints = edges.reshape(-1, 2)
+    num_endpoints = len(endpoints)
+    t_endpoints = ray_hit_fractions(endpoints[:, 0], endpoints[:, 1], np.full(num_endpoints, -dx),
+                                    np.full(num_endpoints, -dy), sides)
+    return float(min(t_corners.min(), t_endpoints.min()))
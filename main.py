@@ -1,9 +1,21 @@
-from pyglet import app
+import argparse
+
+from pyglet import app, text
 from game_objects.car import Car
-from ai.ai_controller import AIController
+from ai.numpy_policy import NumpyPolicy
 from controls import Controls
 from window import GameWindow
 from game_objects.Track.track import Track
+from profiler import NULL_PROFILER, Profiler
+
+parser = argparse.ArgumentParser(description="Drive manually or let the AI drive.")
+parser.add_argument("--policy", help="Q-network weights exported with AIController.export_weights (.npz). "
+                                     "When given, the AI drives with NumPy inference and TensorFlow is never loaded.")
+parser.add_argument("--train", action="store_true", help="Train the Q-network on a background thread while the AI drives. "
+                                                         "The frame loop only runs NumPy inference.")
+parser.add_argument("--profile", action="store_true", help="Time each phase of the frame and show rolling percentiles.")
+parser.add_argument("--profile-csv", help="Also write one row of per-frame timings and counters to this CSV file.")
+args = parser.parse_args()
 
 # Initialize the game window
 window = GameWindow()
@@ -21,12 +33,63 @@ start_point = track.start_point
 # Create the car
 car = Car(start_point[0], start_point[1], window.get_car_image(), window.get_batch(), scale=0.05)
 
+# Frame profiler; the null profiler keeps instrumentation free when disabled
+if args.profile or args.profile_csv:
+    profiler = Profiler(
+        sections=("rays", "action", "physics", "collision", "render"),
+        counters=("model_calls", "narrow_tests", "culled_tests"),
+        csv_path=args.profile_csv,
+    )
+    profile_label = text.Label("", font_name="Courier New", font_size=10, x=10, y=window.height - 10,
+                               anchor_y="top", multiline=True, width=600, batch=window.get_batch())
+else:
+    profiler = NULL_PROFILER
+    profile_label = None
+car.profiler = profiler
+report_every = 30  # Frames between on-screen report refreshes
+
 # Define state and action sizes for the AI
 state_size = 9  # 8 ray distances + 1 velocity
 action_size = 5  # Accelerate, Decelerate, Turn Left, Turn Right, Do Nothing
 
-# Initialize AI Controller
-ai_controller = AIController(state_size=state_size, action_size=action_size)
+# AI Controller, created on first use so manual driving never imports TensorFlow
+ai_controller = NumpyPolicy.load(args.policy) if args.policy else None
+
+# Background learner; the car is driven by its NumPy snapshot of the Q-network
+learner = None
+env = None
+train_state = None  # Current state of the training episode, None before it starts
+if args.train:
+    from ai.ai_controller import AIController
+    from training.async_learner import AsyncLearner
+    from training.environment import DrivingEnv
+
+    learner = AsyncLearner(AIController(state_size=state_size, action_size=action_size)).start()
+    ai_controller = learner.make_policy()
+    env = DrivingEnv(car, track, dt=window.get_frame_rate())
+
+
+def get_ai_controller():
+    """Return the AI controller, building the trainable TensorFlow one on demand."""
+    global ai_controller
+    if ai_controller is None:
+        from ai.ai_controller import AIController
+        ai_controller = AIController(state_size=state_size, action_size=action_size)
+    return ai_controller
+
+
+def train_step():
+    """Advance the training episode by one fixed step and hand the transition to the learner."""
+    global train_state
+    learner.refresh(ai_controller)
+    if train_state is None:
+        train_state = env.reset()
+    with profiler.section("action"):
+        action = ai_controller.get_action(train_state)
+    profiler.count("model_calls")
+    next_state, reward, done = env.step(action)
+    learner.submit(train_state, action, reward, next_state, done and not env.timed_out)
+    train_state = env.reset() if done else next_state
 
 
 def update(dt):
@@ -36,9 +99,20 @@ def update(dt):
     Args:
         dt (float): Time elapsed since the last frame.
     """
-    if controls.is_ai_enabled():
-        car.update(dt, {}, track.get_track_data(), ai_controller=ai_controller)
+    global train_state
+
+    # A frame spans this update and the draw that followed the previous one
+    profiler.end_frame()
+    if profile_label is not None and profiler.frames % report_every == 0:
+        profile_label.text = profiler.report()
+
+    car.set_show_rays(controls.are_rays_visible())
+    if controls.is_ai_enabled() and learner is not None:
+        train_step()
+    elif controls.is_ai_enabled():
+        car.update(dt, {}, track.get_track_data(), ai_controller=get_ai_controller())
     else:
+        train_state = None  # Manual driving moves the car, so the next training step starts a new episode
         manual_input = controls.get_manual_input()
         car.update(dt, manual_input, track.get_track_data())
 
@@ -48,12 +122,18 @@ def on_draw():
     """
     Render the game window.
     """
-    window.get_window().clear()
-    window.get_batch().draw()
+    with profiler.section("render"):
+        window.get_window().clear()
+        window.get_batch().draw()
 
 
 # Schedule updates
 window.schedule_update(update)
 
 # Run the game loop
-app.run()
+try:
+    app.run()
+finally:
+    if learner is not None:
+        learner.stop(timeout=1.0)
+    profiler.close()
@@ -0,0 +1,146 @@
+import contextlib
+import csv
+import time
+
+import numpy as np
+
+
+class Profiler:
+    def __init__(self, sections, counters=(), window=600, csv_path=None):
+        """
+        Per-frame timers and counters with rolling percentiles.
+
+        Wrap each phase of a frame in `section(name)`, bump counters with
+        `count(name, n)`, and call `end_frame()` once per frame to roll the
+        totals into the history (and the CSV file, if any).
+
+        Args:
+            sections (list): Names of the timed phases, in report order.
+            counters (list): Names of the per-frame counters, in report order.
+            window (int): Number of recent frames kept for percentiles.
+            csv_path (str): Optional file receiving one row per frame.
+        """
+        self.enabled = True
+        self.section_names = list(sections)
+        self.counter_names = list(counters)
+        self.window = window
+
+        self._times = dict.fromkeys(self.section_names, 0.0)  # Seconds spent in each section this frame
+        self._counts = dict.fromkeys(self.counter_names, 0)  # Counter totals this frame
+        self._sections = {name: _Section(self._times, name) for name in self.section_names}
+        self._history = np.zeros((window, len(self.section_names) + len(self.counter_names)))
+        self.frames = 0
+
+        self._csv_file = None
+        self._csv_writer = None
+        if csv_path:
+            self._csv_file = open(csv_path, "w", newline="")
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(["frame"] + [f"{name}_ms" for name in self.section_names] + self.counter_names)
+
+    def section(self, name):
+        """Context manager adding its wall time to section `name` for this frame."""
+        return self._sections[name]
+
+    def count(self, name, n=1):
+        """Add `n` to counter `name` for this frame."""
+        self._counts[name] += n
+
+    def end_frame(self):
+        """Store this frame's totals in the rolling history and start a new frame."""
+        row = self._history[self.frames % self.window]
+        for i, name in enumerate(self.section_names):
+            row[i] = self._times[name] * 1000.0  # Milliseconds
+            self._times[name] = 0.0
+        offset = len(self.section_names)
+        for i, name in enumerate(self.counter_names):
+            row[offset + i] = self._counts[name]
+            self._counts[name] = 0
+
+        if self._csv_writer is not None:
+            self._csv_writer.writerow([self.frames] + [f"{value:.4f}" for value in row[:offset]]
+                                      + [int(value) for value in row[offset:]])
+        self.frames += 1
+
+    def percentiles(self, q=(50, 95, 99)):
+        """
+        Percentiles of every section and counter over the recent frames.
+
+        Args:
+            q (tuple): Percentiles to compute.
+
+        Returns:
+            dict: Name to an array of len(q) values; sections are in milliseconds.
+        """
+        history = self._history[:min(self.frames, self.window)]
+        if len(history) == 0:
+            values = np.zeros((len(q), history.shape[1]))
+        else:
+            values = np.percentile(history, q, axis=0)
+        names = self.section_names + self.counter_names
+        return {name: values[:, i] for i, name in enumerate(names)}
+
+    def report(self, q=(50, 95, 99)):
+        """
+        Format the rolling percentiles as a text table.
+
+        Returns:
+            str: One line per section and counter.
+        """
+        stats = self.percentiles(q)
+        header = "".join(f"{f'p{p}':>10}" for p in q)
+        lines = [f"{'':<14}{header}"]
+        for name in self.section_names:
+            lines.append(f"{name + ' ms':<14}" + "".join(f"{value:>10.3f}" for value in stats[name]))
+        for name in self.counter_names:
+            lines.append(f"{name:<14}" + "".join(f"{value:>10.0f}" for value in stats[name]))
+        return "\n".join(lines)
+
+    def close(self):
+        """Flush and close the CSV file."""
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+
+
+class NullProfiler:
+    """Stand-in with the `Profiler` interface that records nothing."""
+
+    enabled = False
+
+    def section(self, name):
+        return _NULL_SECTION
+
+    def count(self, name, n=1):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def report(self, q=(50, 95, 99)):
+        return ""
+
+    def close(self):
+        pass
+
+
+class _Section:
+    __slots__ = ("times", "name", "start")
+
+    def __init__(self, times, name):
+        self.times = times
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.times[self.name] += time.perf_counter() - self.start
+        return False
+
+
+_NULL_SECTION = contextlib.nullcontext()
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,138 @@
+"""
+Background learner thread: the actor side only runs cheap NumPy inference and
+hands transitions over, while gradient steps happen off the simulation thread.
+"""
+import queue
+import threading
+
+import numpy as np
+
+from ai.numpy_policy import NumpyPolicy
+
+
+class AsyncLearner:
+    def __init__(self, controller, train_every=4, publish_every=50, queue_size=10000, checkpointer=None,
+                 checkpoint_every=0):
+        """
+        Train an `AIController` on a daemon thread fed by a transition queue.
+
+        Only the learner thread touches the TensorFlow model. Every
+        `publish_every` updates it snapshots the layer weights and epsilon and
+        publishes them as one tuple, so actors never see a half-written set of
+        weights. Actors drive with a `NumpyPolicy` and call `refresh` each
+        frame, which only copies weights when a newer snapshot exists.
+
+        Args:
+            controller (AIController): The learner; owned by the thread once started.
+            train_every (int): Transitions received per minibatch update, so
+                the learner cannot outrun the data or hog the CPU.
+            publish_every (int): Updates between weight snapshots.
+            queue_size (int): Transitions buffered before `submit` drops new ones.
+            checkpointer (Checkpointer): Saves the controller's training state.
+            checkpoint_every (int): Updates between checkpoints; 0 never saves.
+        """
+        self.controller = controller
+        self.train_every = train_every
+        self.publish_every = publish_every
+        self.checkpointer = checkpointer
+        self.checkpoint_every = checkpoint_every
+        self.transitions = queue.Queue(maxsize=queue_size)
+
+        self.received = 0  # Transitions moved into replay memory
+        self.dropped = 0  # Transitions lost because the queue was full
+        self.updates = 0  # Minibatch updates run
+        self._published = None  # (version, kernels, biases, activations, epsilon)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.publish()
+
+    def start(self):
+        """Start the learner thread."""
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Ask the learner thread to finish its current update and exit."""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def submit(self, state, action, reward, next_state, done):
+        """
+        Hand one transition to the learner without blocking.
+
+        Returns:
+            bool: False if the queue was full and the transition was dropped.
+        """
+        try:
+            self.transitions.put_nowait((state, action, reward, next_state, done))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def publish(self):
+        """Snapshot the controller's weights and epsilon for the actors."""
+        kernels, biases, activations = self.controller.get_layer_weights()
+        version = self._published[0] + 1 if self._published else 1
+        self._published = (version, kernels, biases, activations, self.controller.epsilon)
+
+    def make_policy(self):
+        """
+        Build an actor policy from the latest snapshot.
+
+        Returns:
+            NumpyPolicy: Policy with a `version` attribute used by `refresh`.
+        """
+        version, kernels, biases, activations, epsilon = self._published
+        policy = NumpyPolicy(kernels, biases, activations, epsilon=epsilon)
+        policy.version = version
+        return policy
+
+    def refresh(self, policy):
+        """
+        Copy newer published weights into an actor policy, if there are any.
+
+        Args:
+            policy (NumpyPolicy): Policy from `make_policy`.
+
+        Returns:
+            bool: True if the policy was updated.
+        """
+        version, kernels, biases, _, epsilon = self._published
+        if version == policy.version:
+            return False
+        policy.set_weights(kernels, biases)
+        policy.epsilon = epsilon
+        policy.version = version
+        return True
+
+    def _drain(self, block):
+        """Move queued transitions into replay memory as one batch."""
+        batch = []
+        try:
+            if block:
+                batch.append(self.transitions.get(timeout=0.1))
+            while True:
+                batch.append(self.transitions.get_nowait())
+        except queue.Empty:
+            pass
+        if batch:
+            self.controller.memory.add_batch(*(np.asarray(part) for part in zip(*batch)))
+            self.received += len(batch)
+
+    def _run(self):
+        """Learner thread: train in step with the incoming data and publish snapshots."""
+        controller = self.controller
+        while not self._stop.is_set():
+            # Wait for data when the learner has caught up with the actors or memory is still filling
+            ready = (self.updates * self.train_every < self.received
+                     and len(controller.memory) >= controller.batch_size)
+            self._drain(block=not ready)
+            if not ready:
+                continue
+            controller.replay()
+            self.updates += 1
+            if self.updates % self.publish_every == 0:
+                self.publish()
+            if self.checkpointer and self.checkpoint_every and self.updates % self.checkpoint_every == 0:
+                self.checkpointer.save(self.controller, self.updates)
@@ -0,0 +1,136 @@
+"""
+Periodic training checkpoints written from a background thread.
+"""
+import glob
+import os
+import queue
+import threading
+
+import numpy as np
+
+
+class Checkpointer:
+    def __init__(self, directory, keep=3, include_replay=False):
+        """
+        Save and restore `AIController` training state under `directory`.
+
+        `save` only copies the state on the calling thread; serialising and
+        writing the file happens on a background thread. Files are written
+        under a temporary name and renamed into place, so a crash mid-write
+        never leaves a truncated checkpoint behind. If a save is requested
+        while the previous one is still being written, the newer snapshot
+        replaces any snapshot still waiting. A failed write is reported and
+        kept in `error`; the writer keeps running and the next `save` or
+        `flush` raises it.
+
+        Args:
+            directory (str): Folder holding the `ckpt-<step>.npz` files.
+            keep (int): Number of most recent checkpoints kept on disk.
+            include_replay (bool): Also store the replay memory.
+        """
+        self.directory = directory
+        self.keep = keep
+        self.include_replay = include_replay
+        os.makedirs(directory, exist_ok=True)
+
+        self.error = None  # Last write failure not yet raised to the caller
+        self._pending = queue.Queue(maxsize=1)
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def save(self, controller, step):
+        """
+        Queue a checkpoint of the controller's current training state.
+
+        Args:
+            controller (AIController): The learner to snapshot.
+            step (int): Training progress recorded with the checkpoint.
+
+        Raises:
+            Exception: The error of an earlier checkpoint that failed to write.
+        """
+        self._raise_error()
+        state = controller.get_training_state(include_replay=self.include_replay)
+        state["step"] = np.array(step)
+        while True:
+            try:
+                self._pending.put_nowait((step, state))
+                return
+            except queue.Full:
+                try:
+                    self._pending.get_nowait()  # Drop the stale snapshot
+                    self._pending.task_done()
+                except queue.Empty:
+                    pass
+
+    def flush(self):
+        """
+        Block until every queued checkpoint is on disk.
+
+        Raises:
+            Exception: The error of a checkpoint that failed to write.
+        """
+        self._pending.join()
+        self._raise_error()
+
+    def latest(self):
+        """
+        Find the newest checkpoint in the directory.
+
+        Returns:
+            str: Path of the checkpoint, or None if there is none.
+        """
+        paths = self._checkpoints()
+        return paths[-1] if paths else None
+
+    def restore(self, controller, path=None):
+        """
+        Load a checkpoint into the controller.
+
+        Args:
+            controller (AIController): The learner to restore.
+            path (str): Checkpoint to load; the latest one if None.
+
+        Returns:
+            int: The step stored with the checkpoint, or None if there was
+                nothing to restore.
+        """
+        path = path or self.latest()
+        if path is None:
+            return None
+        with np.load(path) as state:
+            controller.set_training_state(state)
+            return int(state["step"])
+
+    def _checkpoints(self):
+        """Checkpoint paths, oldest first."""
+        return sorted(glob.glob(os.path.join(self.directory, "ckpt-*.npz")))
+
+    def _raise_error(self):
+        """Raise, and clear, the last failure of the writer thread."""
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def _write_loop(self):
+        """Background thread: write queued snapshots and prune old files."""
+        while True:
+            step, state = self._pending.get()
+            path = os.path.join(self.directory, f"ckpt-{step:012d}.npz")
+            temp_path = path + ".tmp"
+            try:
+                with open(temp_path, "wb") as f:
+                    np.savez(f, **state)
+                os.replace(temp_path, path)
+                for old in self._checkpoints()[:-self.keep]:
+                    os.remove(old)
+            except Exception as error:
+                # Keep the writer alive so later saves and `flush` still work
+                print(f"Failed to write checkpoint {path}: {error}")
+                self.error = error
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            finally:
+                self._pending.task_done()
@@ -0,0 +1,120 @@
+"""
+Episodic driving environment with rewards for progress along the track.
+"""
+import numpy as np
+
+
+class DrivingEnv:
+    def __init__(self, car, track, dt=1 / 60, max_steps=3000, crash_penalty=-1.0, progress_scale=100.0,
+                 lap_bonus=1.0, search_margin=32.0):
+        """
+        Wrap a car and a track in a `reset()` / `step(action)` episode API.
+
+        The reward for a step is the arc length gained along the track's
+        centerline divided by `progress_scale`, so driving backwards is
+        penalised. An episode ends on a crash, after `max_steps` steps, or
+        after one full lap of a closed track.
+
+        Args:
+            car (CarPhysics): The car to drive; a pyglet `Car` also works.
+            track (TrackGeometry): Track providing the walls and centerline.
+            dt (float): Simulated seconds per step.
+            max_steps (int): Time limit of an episode in steps.
+            crash_penalty (float): Reward for the step that hits a wall.
+            progress_scale (float): Pixels of progress worth a reward of 1.
+            lap_bonus (float): Extra reward for completing a lap.
+            search_margin (float): Arc length searched around the previous
+                progress beyond the farthest the car can drive in one step.
+        """
+        self.car = car
+        self.track = track
+        self.track_data = track.get_track_data()
+        self.centerline = track.get_centerline()
+        self.dt = dt
+        self.max_steps = max_steps
+        self.crash_penalty = crash_penalty
+        self.progress_scale = progress_scale
+        self.lap_bonus = lap_bonus
+        self.search_radius = car.max_speed * dt + search_margin  # Centerline window searched each step
+
+        self.steps = 0  # Steps taken in the current episode
+        self.arc_position = 0.0  # Car's arc length along the centerline
+        self.progress = 0.0  # Net distance driven along the centerline this episode
+        self.episode_reward = 0.0
+        self.crashed = False
+        self.timed_out = False  # Episode hit `max_steps`; not a true terminal state
+        self.finished = False
+
+    def set_track(self, track):
+        """
+        Switch the track used from the next `reset()` on, e.g. between curriculum episodes.
+
+        With tracks from a `TrackRegistry` this only swaps references.
+
+        Args:
+            track (TrackGeometry): The new track.
+        """
+        self.track = track
+        self.track_data = track.get_track_data()
+        self.centerline = track.get_centerline()
+
+    def reset(self):
+        """
+        Put the car back on the start point and begin a new episode.
+
+        Returns:
+            np.ndarray: The initial state.
+        """
+        self.car.reset(self.track.start_point)
+        self.steps = 0
+        self.arc_position = self.centerline.project(self.car.x, self.car.y)
+        self.progress = 0.0
+        self.episode_reward = 0.0
+        self.crashed = False
+        self.timed_out = False
+        self.finished = False
+        return self._state()
+
+    def step(self, action):
+        """
+        Apply one action and advance the simulation by `dt`.
+
+        Args:
+            action (int): Discrete action, as in `CarPhysics.perform_action`.
+
+        Returns:
+            tuple: (state, reward, done).
+        """
+        # Same profiler sections and counters as `CarPhysics.update`, which this bypasses
+        self.car.reset_stats()
+        profiler = self.car.profiler
+        with profiler.section("physics"):
+            self.car.perform_action(action)
+        self.car.last_action = action
+        self.crashed = self.car.move(self.dt, self.track_data)
+        self.steps += 1
+
+        if self.crashed:
+            reward = self.crash_penalty
+        else:
+            arc_position = self.centerline.project(self.car.x, self.car.y, hint=self.arc_position,
+                                                  radius=self.search_radius)
+            gained = self.centerline.delta(self.arc_position, arc_position)
+            self.arc_position = arc_position
+            self.progress += gained
+            reward = gained / self.progress_scale
+            if self.centerline.closed and self.progress >= self.centerline.total_length:
+                self.finished = True
+                reward += self.lap_bonus
+
+        self.timed_out = self.steps >= self.max_steps and not (self.crashed or self.finished)
+        self.episode_reward += reward
+        with profiler.section("rays"):
+            state = self._state()
+        profiler.count("narrow_tests", self.car.stats["narrow_tests"])
+        profiler.count("culled_tests", self.car.stats["culled_tests"])
+        return state, reward, self.crashed or self.finished or self.timed_out
+
+    def _state(self):
+        """Controller input for the car's current position."""
+        return np.asarray(self.car.get_state(self.track_data), dtype=np.float32)
@@ -0,0 +1,197 @@
+"""
+Parallel rollout collection: K worker processes simulate headless cars with a
+NumPy copy of the policy and stream transitions to a central learner that owns
+the `AIController`.
+
+Run from the repository root:
+
+    python -m training.rollout_workers --workers 8 --iterations 100
+    python -m training.rollout_workers --iterations 10000 --checkpoint-dir checkpoints --resume
+"""
+import argparse
+import multiprocessing as mp
+import time
+
+import numpy as np
+
+from ai.numpy_policy import NumpyPolicy
+from game_objects.car_physics import CarPhysics
+from game_objects.Track.track_geometry import TrackGeometry
+from training.checkpoint import Checkpointer
+from training.runner import FixedStepRunner, seed_everything
+
+
+def rollout_worker(conn, track_file, steps_per_rollout, dt, seed):
+    """
+    Worker process loop: wait for commands on `conn` and answer rollouts.
+
+    Commands are tuples:
+        ("weights", kernels, biases, activations, epsilon): replace the policy.
+        ("rollout",): simulate `steps_per_rollout` steps and send the transitions.
+        ("stop",): exit.
+    """
+    seed_everything(seed)
+    track = TrackGeometry(track_file)
+    track_data = track.get_track_data()
+    car = CarPhysics.from_image_file(*track.start_point, scale=0.05)
+    runner = None
+
+    state_size = car.num_rays + 1
+    states = np.zeros((steps_per_rollout, state_size), dtype=np.float32)
+    actions = np.zeros(steps_per_rollout, dtype=np.int64)
+    rewards = np.zeros(steps_per_rollout, dtype=np.float32)
+    next_states = np.zeros((steps_per_rollout, state_size), dtype=np.float32)
+    dones = np.zeros(steps_per_rollout, dtype=np.bool_)
+
+    while True:
+        command = conn.recv()
+        if command[0] == "stop":
+            break
+        if command[0] == "weights":
+            _, kernels, biases, activations, epsilon = command
+            if runner is None:
+                runner = FixedStepRunner(car, track_data, NumpyPolicy(kernels, biases, activations), dt=dt)
+            runner.controller.set_weights(kernels, biases)
+            runner.controller.epsilon = epsilon
+        elif command[0] == "rollout":
+            for i in range(steps_per_rollout):
+                states[i], actions[i], rewards[i], next_states[i], dones[i] = runner.step()
+            conn.send((states, actions, rewards, next_states, dones))
+    conn.close()
+
+
+class RolloutPool:
+    def __init__(self, num_workers, track_file="game_objects/Track/track.json", steps_per_rollout=256,
+                 dt=1 / 60, seed=0):
+        """
+        Start `num_workers` rollout processes, each with its own car and track.
+
+        Workers use the "spawn" start method and only import NumPy code, so
+        they never load TensorFlow or inherit the learner's graph state.
+
+        Args:
+            num_workers (int): Number of worker processes.
+            track_file (str): Track every worker drives on.
+            steps_per_rollout (int): Transitions each worker returns per rollout.
+            dt (float): Simulated seconds per step.
+            seed (int): Base seed; worker `i` uses `seed + i`.
+        """
+        context = mp.get_context("spawn")
+        self.connections = []
+        self.processes = []
+        for i in range(num_workers):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=rollout_worker,
+                args=(child_conn, track_file, steps_per_rollout, dt, seed + i),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self.connections.append(parent_conn)
+            self.processes.append(process)
+
+    def broadcast_weights(self, kernels, biases, activations, epsilon):
+        """Send the latest policy parameters to every worker."""
+        for conn in self.connections:
+            conn.send(("weights", kernels, biases, activations, epsilon))
+
+    def collect(self):
+        """
+        Run one rollout on every worker in parallel.
+
+        Returns:
+            tuple: (states, actions, rewards, next_states, dones) concatenated
+                over all workers.
+        """
+        for conn in self.connections:
+            conn.send(("rollout",))
+        batches = [conn.recv() for conn in self.connections]
+        return tuple(np.concatenate(parts) for parts in zip(*batches))
+
+    def close(self):
+        """Stop and join every worker."""
+        for conn in self.connections:
+            conn.send(("stop",))
+            conn.close()
+        for process in self.processes:
+            process.join()
+
+
+def train(controller, pool, iterations, updates_per_rollout=4, sync_every=1, report_every=10, checkpointer=None,
+          checkpoint_every=0, first_iteration=1):
+    """
+    Central learner loop: gather rollouts, train on replay, push fresh weights.
+
+    Args:
+        controller (AIController): The learner.
+        pool (RolloutPool): Running workers.
+        iterations (int): Number of collect/train rounds.
+        updates_per_rollout (int): Minibatch updates after each collection.
+        sync_every (int): Rounds between weight broadcasts.
+        report_every (int): Rounds between progress prints; 0 stays quiet.
+        checkpointer (Checkpointer): Saves the learner's training state.
+        checkpoint_every (int): Rounds between checkpoints; 0 never saves.
+        first_iteration (int): Number of the first round, e.g. after resuming.
+    """
+    pool.broadcast_weights(*controller.get_layer_weights(), controller.epsilon)
+    transitions = 0
+    start = time.perf_counter()
+    for iteration in range(first_iteration, first_iteration + iterations):
+        batch = pool.collect()
+        controller.memory.add_batch(*batch)
+        transitions += len(batch[1])
+        for _ in range(updates_per_rollout):
+            controller.replay()
+
+        if iteration % sync_every == 0:
+            pool.broadcast_weights(*controller.get_layer_weights(), controller.epsilon)
+        if checkpointer and checkpoint_every and iteration % checkpoint_every == 0:
+            checkpointer.save(controller, iteration)
+        if report_every and iteration % report_every == 0:
+            elapsed = time.perf_counter() - start
+            print(f"iteration {iteration}: {transitions / elapsed:.0f} transitions/s, "
+                  f"epsilon {controller.epsilon:.3f}, mean reward {batch[2].mean():.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=mp.cpu_count())
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--steps-per-rollout", type=int, default=256)
+    parser.add_argument("--updates-per-rollout", type=int, default=4)
+    parser.add_argument("--sync-every", type=int, default=1)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--track", default="game_objects/Track/track.json")
+    parser.add_argument("--prioritized-replay", action="store_true",
+                        help="Replay transitions in proportion to their TD error.")
+    parser.add_argument("--checkpoint-dir", help="Write training checkpoints to this folder.")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="Rounds between checkpoints.")
+    parser.add_argument("--checkpoint-replay", action="store_true", help="Include the replay memory in checkpoints.")
+    parser.add_argument("--resume", action="store_true", help="Continue from the latest checkpoint in --checkpoint-dir.")
+    args = parser.parse_args()
+
+    pool = RolloutPool(args.workers, args.track, args.steps_per_rollout, args.dt, args.seed)
+    try:
+        from ai.ai_controller import AIController
+
+        seed_everything(args.seed)
+        controller = AIController(state_size=9, action_size=5, prioritized_replay=args.prioritized_replay)
+
+        checkpointer = None
+        resumed_at = 0
+        if args.checkpoint_dir:
+            checkpointer = Checkpointer(args.checkpoint_dir, include_replay=args.checkpoint_replay)
+            if args.resume:
+                resumed_at = checkpointer.restore(controller) or 0
+        train(controller, pool, args.iterations, args.updates_per_rollout, args.sync_every,
+              checkpointer=checkpointer, checkpoint_every=args.checkpoint_every, first_iteration=resumed_at + 1)
+        if checkpointer:
+            checkpointer.flush()
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Fixed-timestep training loop that runs the simulation as fast as the CPU allows.
+
+Run from the repository root:
+
+    python -m training.runner --steps 100000 --seed 0
+    python -m training.runner --steps 100000 --render-every 10
+    python -m training.runner --episodes 200 --max-steps 3000
+    python -m training.runner --steps 1000000 --checkpoint-dir checkpoints --resume
+    python -m training.runner --episodes 1000 --tracks game_objects/Track
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from game_objects.car_physics import CarPhysics
+from game_objects.Track.track_geometry import TrackGeometry
+from game_objects.Track.track_registry import TrackRegistry
+from training.checkpoint import Checkpointer
+from training.environment import DrivingEnv
+
+
+def seed_everything(seed):
+    """
+    Seed every random number generator the simulation and learner draw from.
+
+    Call this before building the controller so its weight initialisation is
+    covered as well.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    if "tensorflow" in sys.modules:
+        sys.modules["tensorflow"].random.set_seed(seed)
+
+
+def speed_reward(car, collided, dt):
+    """Reward forward speed and penalise crashes."""
+    if collided:
+        return -1.0
+    return car.velocity * dt / car.max_speed
+
+
+class FixedStepRunner:
+    def __init__(self, car, track_data, controller, dt=1 / 60, train_every=1, reward_fn=speed_reward,
+                 render_every=0, render_fn=None, checkpointer=None, checkpoint_every=0):
+        """
+        Step a car with a fixed `dt`, decoupled from any window clock.
+
+        Args:
+            car (CarPhysics): The car to drive; a pyglet `Car` also works.
+            track_data (dict): Track data from `TrackGeometry.get_track_data`.
+            controller: Object with `get_action(state)`. If it also has
+                `remember` and `replay` (like `AIController`), it is trained.
+            dt (float): Simulated seconds per step.
+            train_every (int): Steps between minibatch updates.
+            reward_fn (callable): `reward_fn(car, collided, dt)` -> float.
+            render_every (int): Call `render_fn` every N steps; 0 never renders.
+            render_fn (callable): Draws the current frame.
+            checkpointer (Checkpointer): Saves the controller's training state.
+            checkpoint_every (int): Steps between checkpoints; 0 never saves.
+        """
+        self.car = car
+        self.track_data = track_data
+        self.controller = controller
+        self.dt = dt
+        self.train_every = train_every
+        self.reward_fn = reward_fn
+        self.render_every = render_every
+        self.render_fn = render_fn
+        self.checkpointer = checkpointer
+        self.checkpoint_every = checkpoint_every
+        self.trains = hasattr(controller, "remember") and hasattr(controller, "replay")
+
+        self.steps = 0
+        self.crashes = 0
+        self.total_reward = 0.0
+        self.state = None  # Car state after the last step, reused as the next step's input
+
+    def clear_state(self):
+        """Forget the cached state; call after resetting or moving the car outside `step`."""
+        self.state = None
+
+    def step(self):
+        """
+        Advance the simulation by exactly one `dt`.
+
+        The rays cast for `next_state` are reused as the next step's `state`,
+        so each step casts them only once.
+
+        Returns:
+            tuple: (state, action, reward, next_state, collided).
+        """
+        state = self.state
+        if state is None:
+            state = self.car.get_state(self.track_data)
+        action = self.controller.get_action(state)
+        self.car.perform_action(action)
+        self.car.last_action = action
+        collided = self.car.move(self.dt, self.track_data)
+        next_state = self.car.get_state(self.track_data)
+        self.state = next_state
+        reward = self.reward_fn(self.car, collided, self.dt)
+
+        if self.trains:
+            self.controller.remember(state, action, reward, next_state, collided)
+            if self.steps % self.train_every == 0:
+                self.controller.replay()
+
+        self.steps += 1
+        self.crashes += collided
+        self.total_reward += reward
+        if self.trains and self.checkpointer and self.checkpoint_every and self.steps % self.checkpoint_every == 0:
+            self.checkpointer.save(self.controller, self.steps)
+        if self.render_every and self.render_fn and self.steps % self.render_every == 0:
+            self.render_fn()
+        return state, action, reward, next_state, collided
+
+    def run(self, num_steps, report_every=0):
+        """
+        Run `num_steps` steps back to back.
+
+        Args:
+            num_steps (int): Number of steps to simulate.
+            report_every (int): Print progress every N steps; 0 stays quiet.
+
+        Returns:
+            float: Steps per second achieved.
+        """
+        start = time.perf_counter()
+        for _ in range(num_steps):
+            self.step()
+            if report_every and self.steps % report_every == 0:
+                elapsed = time.perf_counter() - start
+                print(f"step {self.steps}: {self.steps / elapsed:.0f} steps/s, "
+                      f"{self.crashes} crashes, reward {self.total_reward:.2f}")
+        return num_steps / (time.perf_counter() - start)
+
+
+def run_episodes(env, controller, num_episodes, train_every=1, report_every=0, checkpointer=None,
+                 checkpoint_every=0, first_episode=1, registry=None, track_names=None):
+    """
+    Play whole episodes of a `DrivingEnv`, training the controller if it can learn.
+
+    Time-limit endings are stored as non-terminal transitions so the learner
+    still bootstraps from them.
+
+    Args:
+        env (DrivingEnv): The environment.
+        controller: Object with `get_action(state)`, optionally `remember` and `replay`.
+        num_episodes (int): Number of episodes to play.
+        train_every (int): Steps between minibatch updates.
+        report_every (int): Print a summary every N episodes; 0 stays quiet.
+        checkpointer (Checkpointer): Saves the controller's training state.
+        checkpoint_every (int): Episodes between checkpoints; 0 never saves.
+        first_episode (int): Number of the first episode, e.g. after resuming.
+        registry (TrackRegistry): Source of the curriculum tracks.
+        track_names (list): Tracks to cycle through, one per episode; the
+            environment keeps its track if None.
+
+    Returns:
+        list: Total reward of every episode.
+    """
+    trains = hasattr(controller, "remember") and hasattr(controller, "replay")
+    returns = []
+    steps = 0
+    for episode in range(first_episode, first_episode + num_episodes):
+        if track_names:
+            env.set_track(registry.get(track_names[(episode - 1) % len(track_names)]))
+        state = env.reset()
+        done = False
+        while not done:
+            action = controller.get_action(state)
+            next_state, reward, done = env.step(action)
+            if trains:
+                controller.remember(state, action, reward, next_state, done and not env.timed_out)
+                if steps % train_every == 0:
+                    controller.replay()
+            state = next_state
+            steps += 1
+
+        returns.append(env.episode_reward)
+        if trains and checkpointer and checkpoint_every and episode % checkpoint_every == 0:
+            checkpointer.save(controller, episode)
+        if report_every and episode % report_every == 0:
+            print(f"episode {episode}: reward {env.episode_reward:.2f}, progress {env.progress:.0f} px, "
+                  f"{env.steps} steps, {'crash' if env.crashed else 'lap' if env.finished else 'time limit'}")
+    return returns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=10000)
+    parser.add_argument("--dt", type=float, default=1 / 60, help="Simulated seconds per step.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--track", default="game_objects/Track/track.json")
+    parser.add_argument("--train-every", type=int, default=4)
+    parser.add_argument("--render-every", type=int, default=0, help="Draw every Nth step; 0 runs headless.")
+    parser.add_argument("--report-every", type=int, default=1000)
+    parser.add_argument("--episodes", type=int, default=0,
+                        help="Play this many episodes with progress rewards instead of a fixed step count.")
+    parser.add_argument("--max-steps", type=int, default=3000, help="Episode time limit in steps.")
+    parser.add_argument("--tracks", help="With --episodes, cycle through every track in this folder, one per episode.")
+    parser.add_argument("--prioritized-replay", action="store_true",
+                        help="Replay transitions in proportion to their TD error.")
+    parser.add_argument("--checkpoint-dir", help="Write training checkpoints to this folder.")
+    parser.add_argument("--checkpoint-every", type=int, default=10000,
+                        help="Steps (or episodes with --episodes) between checkpoints.")
+    parser.add_argument("--checkpoint-replay", action="store_true", help="Include the replay memory in checkpoints.")
+    parser.add_argument("--resume", action="store_true", help="Continue from the latest checkpoint in --checkpoint-dir.")
+    args = parser.parse_args()
+
+    from ai.ai_controller import AIController
+
+    seed_everything(args.seed)
+    controller = AIController(state_size=9, action_size=5, prioritized_replay=args.prioritized_replay)
+    track = TrackGeometry(args.track)
+
+    checkpointer = None
+    resumed_at = 0
+    if args.checkpoint_dir:
+        checkpointer = Checkpointer(args.checkpoint_dir, include_replay=args.checkpoint_replay)
+        if args.resume:
+            resumed_at = checkpointer.restore(controller) or 0
+            print(f"resumed from step {resumed_at}, epsilon {controller.epsilon:.3f}")
+
+    render_fn = None
+    if args.render_every:
+        from game_objects.car import Car
+        from game_objects.Track.track import Track
+        from window import GameWindow
+
+        window = GameWindow()
+        track = Track(window.get_batch(), args.track)
+        car = Car(*track.start_point, window.get_car_image(), window.get_batch(), scale=0.05)
+
+        def render_fn():
+            window.get_window().dispatch_events()
+            window.get_window().clear()
+            window.get_batch().draw()
+            window.get_window().flip()
+    else:
+        # Same collision box as the 0.05-scaled sprite used by main.py
+        car = CarPhysics.from_image_file(*track.start_point, scale=0.05)
+
+    if args.episodes:
+        registry = None
+        track_names = None
+        if args.tracks:
+            registry = TrackRegistry(args.tracks)
+            track_names = registry.trainable_names()
+        env = DrivingEnv(car, track, dt=args.dt, max_steps=args.max_steps)
+        start = time.perf_counter()
+        returns = run_episodes(env, controller, args.episodes, train_every=args.train_every, report_every=1,
+                               checkpointer=checkpointer, checkpoint_every=args.checkpoint_every,
+                               first_episode=resumed_at + 1, registry=registry, track_names=track_names)
+        print(f"{args.episodes} episodes in {time.perf_counter() - start:.1f} s, "
+              f"mean reward {np.mean(returns):.2f}")
+    else:
+        runner = FixedStepRunner(car, track.get_track_data(), controller, dt=args.dt, train_every=args.train_every,
+                                 render_every=args.render_every, render_fn=render_fn, checkpointer=checkpointer,
+                                 checkpoint_every=args.checkpoint_every)
+        runner.steps = resumed_at
+        rate = runner.run(args.steps, report_every=args.report_every)
+        print(f"{args.steps} steps at {rate:.0f} steps/s ({rate * args.dt:.1f}x real time)")
+
+    if checkpointer:
+        checkpointer.flush()
+
+
+if __name__ == "__main__":
+    main()